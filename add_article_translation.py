@@ -277,6 +277,16 @@ TRANSLATION_SCRIPT = '''
         document.head.appendChild(style);
     </script>''' 
 
+def has_translation_features(content):
+    """Check if an article already has the translation tooltip"""
+    return 'translation-tooltip' in content or 'translationTooltip' in content
+
+def apply_translation_features(content):
+    """Add the translation tooltip HTML and script before </body>"""
+    if has_translation_features(content):
+        return content
+    return re.sub(r'</body>', f'{TRANSLATION_TOOLTIP_HTML}{TRANSLATION_SCRIPT}\n    </body>', content, flags=re.IGNORECASE)
+
 def add_translation_to_articles():
     """Add translation functionality to all HTML files in the articles directory."""
     # Get all HTML files in the articles directory
@@ -298,12 +308,12 @@ def add_translation_to_articles():
                 content = f.read()
             
             # Check if the file already has translation functionality
-            if 'translation-tooltip' in content or 'translationTooltip' in content:
+            if has_translation_features(content):
                 processed_files += 1
                 continue
             
             # Add translation tooltip HTML and script before </body>
-            updated_content = re.sub(r'</body>', f'{TRANSLATION_TOOLTIP_HTML}{TRANSLATION_SCRIPT}\n    </body>', content, flags=re.IGNORECASE)
+            updated_content = apply_translation_features(content)
             
             # Write the updated content back to the file
             with open(file_path, 'w', encoding='utf-8') as f:
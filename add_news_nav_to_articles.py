@@ -29,6 +29,12 @@ NAV_PATTERNS = [
      '<li><a href="../index.html">首页</a></li>\n    <li><a href="../novels.html">小说</a></li>\n    <li><a href="../webnovels.html">网文</a></li>\n    <li><a href="../news.html">新闻</a></li>\n    <li><a href="../about.html">关于我</a></li>')
 ]
 
+def apply_news_nav(content):
+    """Add the news link to one article's navigation"""
+    for pattern, replacement in NAV_PATTERNS:
+        content = re.sub(pattern, replacement, content, flags=re.DOTALL)
+    return content
+
 def add_news_nav_to_articles():
     """Add news navigation link to all article HTML files."""
     # Get all HTML files in the articles directory
@@ -52,8 +58,7 @@ def add_news_nav_to_articles():
             original_content = content
             
             # Apply all navigation patterns
-            for pattern, replacement in NAV_PATTERNS:
-                content = re.sub(pattern, replacement, content, flags=re.DOTALL)
+            content = apply_news_nav(content)
             
             # If content has changed, write it back to the file
             if content != original_content:
@@ -2,9 +2,16 @@
 """
 Add intelligent tags to articles based on content and add pagination
 """
+import argparse
+import hashlib
+import json
 import os
 import re
-from bs4 import BeautifulSoup
+import sys
+from soup_parser import make_soup
+from build_manifest import BuildManifest
+from webnovels_index import write_index_and_shell
+from keyword_tagger import KeywordTagger, DocumentFrequencies, rank_tags, MATCHER_VERSION
 
 # Common company/organization tags to look for
 COMPANY_KEYWORDS = {
@@ -90,11 +97,19 @@ TOPIC_KEYWORDS = {
     'carbon': 'Climate',
     'regulation': 'Regulation',
     'law': 'Regulation',
+    'lawsuit': 'Regulation',
+    'lawmaker': 'Regulation',
+    'lawyer': 'Regulation',
     'policy': 'Policy',
     'government': 'Government',
     'job': 'Employment',
     'employment': 'Employment',
     'work': 'Employment',
+    'worker': 'Employment',
+    'working': 'Employment',
+    'worked': 'Employment',
+    'workforce': 'Employment',
+    'workplace': 'Employment',
     'career': 'Employment',
     'chatbot': 'Chatbot',
     'agent': 'AI-Agent',
@@ -105,83 +120,104 @@ TOPIC_KEYWORDS = {
     'future': 'Future',
 }
 
-articles_dir = 'articles'
-article_files = sorted([f for f in os.listdir(articles_dir) if f.endswith('.html')])
 
-print(f"Processing {len(article_files)} articles for tag generation...")
+# Names must match as whole words, topics match any word starting with them ('robot' -> 'robotics');
+# topics shorter than MIN_STEM_CHARS match whole words, so they list their inflections
+TAGGER = KeywordTagger(COMPANY_KEYWORDS, stems=TOPIC_KEYWORDS)
+
+# Bump to recompute cached tags when the tagging rules change
+TAGGER_VERSION = hashlib.sha1(json.dumps([COMPANY_KEYWORDS, TOPIC_KEYWORDS, MATCHER_VERSION, 'counts'],
+                                         sort_keys=True).encode()).hexdigest()[:12]
 
-articles_data = []
+MAX_TAGS = 5  # Content tags shown per article, besides 'ai'
 
-for filename in article_files:
-    filepath = os.path.join(articles_dir, filename)
+articles_dir = 'articles'
+
+def analyze_article(filepath, filename):
+    """Extract the title and content tags of one article"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+        soup = make_soup(content)
     
-    try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-            soup = BeautifulSoup(content, 'html.parser')
-        
-        # Get title
-        title_tag = soup.find('title')
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-            title = re.sub(r'\s*-\s*English Novel Reader.*$', '', title)
-        else:
-            title = filename.replace('.html', '').replace('_', ' ').title()
-        
-        # Get text content for analysis
-        text_content = soup.get_text().lower()
-        
-        # Generate tags
-        tags = {'ai'}  # All articles get 'ai' tag
-        
-        # Check for company names
-        for keyword, tag in COMPANY_KEYWORDS.items():
-            if keyword.lower() in text_content:
-                tags.add(tag)
-        
-        # Check for topics
-        for keyword, tag in TOPIC_KEYWORDS.items():
-            if keyword.lower() in text_content:
-                tags.add(tag)
-        
-        # Limit to most relevant tags (max 6)
-        tags_list = sorted(list(tags))[:6]
-        tags_str = ' '.join(tags_list)
-        
-        articles_data.append({
-            'filename': filename,
-            'title': title,
-            'tags': tags_str
-        })
-        
-        print(f"✓ {filename[:50]}: {tags_str}")
-        
-    except Exception as e:
-        print(f"✗ Error processing {filename}: {e}")
-        articles_data.append({
-            'filename': filename,
-            'title': filename.replace('.html', ''),
-            'tags': 'ai'
-        })
+    # Get title
+    title_tag = soup.find('title')
+    if title_tag:
+        title = title_tag.get_text(strip=True)
+        title = re.sub(r'\s*-\s*English Novel Reader.*$', '', title)
+    else:
+        title = filename.replace('.html', '').replace('_', ' ').title()
+    
+    # Get text content for analysis
+    text_content = soup.get_text()
+    
+    # Count tag hits: company names and topics, matched in one pass over the words
+    counts = TAGGER.count_tags(text_content)
+    
+    return {
+        'filename': filename,
+        'title': title,
+        'counts': dict(counts)
+    }
+
+def select_tags(counts, frequencies):
+    """Tag string for an article: its most relevant tags plus 'ai', which all articles get"""
+    return ' '.join(rank_tags(counts, frequencies, MAX_TAGS) + ['ai'])
 
-print(f"\nGenerated tags for {len(articles_data)} articles")
+def collect_articles_data(article_files, manifest, force=False):
+    """Tag every article, reusing manifest results for unchanged files
 
-# Read webnovels.html template
-with open('webnovels.html', 'r', encoding='utf-8') as f:
-    content = f.read()
-    header_end = content.find('<div class="webnovel-content" id="webnovelContent">')
-    if header_end == -1:
-        print("Error: Could not find content section")
-        exit(1)
-    header = content[:header_end + len('<div class="webnovel-content" id="webnovelContent">')]
+    Tag hit counts are cached per article and the corpus document
+    frequencies are updated only for articles that were (re)analyzed, so
+    re-ranking every article's tags never needs to re-read the corpus.
+    """
+    frequencies = DocumentFrequencies(manifest.index('tag_df'))
+    counted = []
+    reused = 0
+    
+    for filename in article_files:
+        filepath = os.path.join(articles_dir, filename)
+        
+        try:
+            outputs = None if force else manifest.get_outputs(filename, filepath, 'tags')
+            if outputs and outputs.get('version') == TAGGER_VERSION:
+                data = {'filename': filename, 'title': outputs['title'], 'counts': outputs['counts']}
+                reused += 1
+            else:
+                data = analyze_article(filepath, filename)
+                data['analyzed'] = True
+                manifest.set_outputs(filename, filepath, 'tags',
+                                     title=data['title'], counts=data['counts'], version=TAGGER_VERSION)
+            if data.get('analyzed') or filename not in frequencies:
+                frequencies.update(filename, data['counts'])
+            counted.append(data)
+            
+        except Exception as e:
+            print(f"✗ Error processing {filename}: {e}")
+            counted.append({
+                'filename': filename,
+                'title': filename.replace('.html', ''),
+                'counts': {}
+            })
+    
+    # Rank once the document frequencies include every changed article
+    articles_data = []
+    for data in counted:
+        articles_data.append({'filename': data['filename'], 'title': data['title'],
+                              'tags': select_tags(data['counts'], frequencies)})
+        if data.get('analyzed'):
+            print(f"✓ {data['filename'][:50]}: {articles_data[-1]['tags']}")
+    
+    if reused:
+        print(f"  (reused tags for {reused} unchanged articles)")
+    
+    return articles_data
 
-# Generate article HTML with new tags
-articles_html = []
-for data in articles_data:
+def render_article_entry(data):
+    """HTML of one article's entry in the webnovels list"""
     tags_list = data['tags'].split()
     tags_html = ' '.join([f'<span class="article-tag">{tag}</span>' for tag in tags_list])
-    
-    article_html = f'''                    <div class="webnovel-article" data-tags="{data['tags']}">
+
+    return f'''                    <div class="webnovel-article" data-tags="{data['tags']}">
                         <h2 class="webnovel-title">
                             <a href="articles/{data['filename']}" class="webnovel-title-link">
                                 {data['title']}
@@ -191,10 +227,23 @@ for data in articles_data:
                             {tags_html}
                         </div>
                     </div>'''
-    articles_html.append(article_html)
 
-# Generate footer with pagination JavaScript
-footer = f'''
+def write_webnovels_page(articles_data):
+    """Write webnovels_with_tags.html from the tagged articles"""
+    # Read webnovels.html template
+    with open('webnovels.html', 'r', encoding='utf-8') as f:
+        content = f.read()
+        header_end = content.find('<div class="webnovel-content" id="webnovelContent">')
+        if header_end == -1:
+            print("Error: Could not find content section")
+            sys.exit(1)
+        header = content[:header_end + len('<div class="webnovel-content" id="webnovelContent">')]
+
+    # Generate article HTML with new tags
+    articles_html = [render_article_entry(data) for data in articles_data]
+
+    # Generate footer with pagination JavaScript
+    footer = f'''
                 </div>
                 
                 <!-- Pagination Controls -->
@@ -336,13 +385,41 @@ footer = f'''
 </body>
 </html>'''
 
-# Write new webnovels.html
-new_html = header + '\n' + '\n'.join(articles_html) + footer
+    # Write new webnovels.html
+    new_html = header + '\n' + '\n'.join(articles_html) + footer
+
+    with open('webnovels_with_tags.html', 'w', encoding='utf-8') as f:
+        f.write(new_html)
 
-with open('webnovels_with_tags.html', 'w', encoding='utf-8') as f:
-    f.write(new_html)
+    print(f"\n✓ Generated webnovels_with_tags.html with {len(articles_data)} articles")
+    print(f"  - Pagination: 10 articles per page")
+    print(f"  - Auto-generated tags based on content")
+    print(f"\nRun: mv webnovels.html webnovels_no_tags.html && mv webnovels_with_tags.html webnovels.html")
+
+def main():
+    parser = argparse.ArgumentParser(description='Tag articles and generate the paginated webnovels page')
+    parser.add_argument('--full', action='store_true', help='ignore the build manifest and re-tag every article')
+    parser.add_argument('--json', action='store_true',
+                        help='write the article list to webnovels_index.json and a shell page that renders it')
+    parser.add_argument('--compress', action='store_true', help='with --json, also write precompressed .gz/.br copies')
+    args = parser.parse_args()
+    
+    article_files = sorted([f for f in os.listdir(articles_dir) if f.endswith('.html')])
+    
+    print(f"Processing {len(article_files)} articles for tag generation...")
+    
+    manifest = BuildManifest()
+    DocumentFrequencies(manifest.index('tag_df')).prune(article_files)
+    articles_data = collect_articles_data(article_files, manifest, force=args.full)
+    manifest.prune(article_files)
+    manifest.save()
+    
+    print(f"\nGenerated tags for {len(articles_data)} articles")
+    
+    if args.json:
+        write_index_and_shell(articles_data, 'webnovels_with_tags.html', compress=args.compress)
+    else:
+        write_webnovels_page(articles_data)
 
-print(f"\n✓ Generated webnovels_with_tags.html with {len(articles_data)} articles")
-print(f"  - Pagination: 10 articles per page")
-print(f"  - Auto-generated tags based on content")
-print(f"\nRun: mv webnovels.html webnovels_no_tags.html && mv webnovels_with_tags.html webnovels.html")
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Single-pass article pipeline
+
+Runs the article maintenance steps as in-memory transforms instead of one
+whole-directory rewrite script per step:
+1. bilingual       - process_articles_bilingual (bilingual structure, ad cleanup)
+2. translate       - translate_articles (fill translation placeholders)
+3. placeholders    - remove_translation_placeholders (only with --stages)
+4. news_nav        - add_news_nav_to_articles
+5. translation_ui  - add_article_translation (click-to-translate tooltip)
+
+The placeholders stage deletes the Chinese slots that translate still has
+to fill (including those kept after failed translations), so it is not run
+by default and is dropped whenever the translate stage cannot run.
+
+Each article is read once, passed through the selected stages, and written
+back at most once, atomically. Per-stage timings are reported at the end.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+ARTICLES_DIR = 'articles'
+
+def stage_bilingual(content):
+    from process_articles_bilingual import build_bilingual_html
+    new_content = build_bilingual_html(content)
+    return new_content if new_content is not None else content
+
+_translate_many = None
+
+def stage_translate(content):
+    global _translate_many
+    from translate_articles import translate_html, make_translator
+    # Avoid a parse and re-serialization when there is nothing to translate
+    if '[翻译占位' not in content and 'Translation placeholder' not in content and '>[翻译失败' not in content:
+        return content
+    if _translate_many is None:
+        _translate_many = make_translator()
+    new_content, count = translate_html(content, _translate_many)
+    return new_content if count else content
+
+def stage_placeholders(content):
+    from remove_translation_placeholders import strip_placeholders
+    new_content, _ = strip_placeholders(content)
+    return new_content
+
+def stage_news_nav(content):
+    from add_news_nav_to_articles import apply_news_nav
+    return apply_news_nav(content)
+
+def stage_translation_ui(content):
+    from add_article_translation import apply_translation_features
+    return apply_translation_features(content)
+
+# Stages in the order the standalone scripts are meant to be run
+STAGES = [
+    ('bilingual', stage_bilingual),
+    ('translate', stage_translate),
+    ('placeholders', stage_placeholders),
+    ('news_nav', stage_news_nav),
+    ('translation_ui', stage_translation_ui),
+]
+DEFAULT_STAGES = ['bilingual', 'translate', 'news_nav', 'translation_ui']
+
+def select_stages(selected, skipped=(), has_translator=None):
+    """(name, stage) pairs to run, in pipeline order"""
+    stages = [(name, stage) for name, stage in STAGES if name in selected and name not in skipped]
+
+    # Translating without the library would write "[翻译服务不可用]" into every article,
+    # and removing placeholders would then throw away the slots still waiting for a translation
+    if any(name == 'translate' for name, _ in stages):
+        if has_translator is None:
+            from translate_articles import HAS_TRANSLATOR as has_translator
+        if not has_translator:
+            print("⚠️  Translation library not available, skipping the translate and placeholders stages")
+            stages = [(name, stage) for name, stage in stages if name not in ('translate', 'placeholders')]
+    return stages
+
+def atomic_write(path, content):
+    """Write content to path via a temporary file so readers never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix='.html')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def run_pipeline(filepaths, stages):
+    """Run stages over each file; returns (timings, written, errors)"""
+    timings = {name: 0.0 for name in ['read'] + [name for name, _ in stages] + ['write']}
+    written = 0
+    errors = 0
+
+    for i, filepath in enumerate(filepaths, 1):
+        filename = os.path.basename(filepath)
+        try:
+            start = time.perf_counter()
+            with open(filepath, 'r', encoding='utf-8') as f:
+                original = f.read()
+            timings['read'] += time.perf_counter() - start
+
+            content = original
+            for name, stage in stages:
+                start = time.perf_counter()
+                content = stage(content)
+                timings[name] += time.perf_counter() - start
+
+            if content != original:
+                start = time.perf_counter()
+                atomic_write(filepath, content)
+                timings['write'] += time.perf_counter() - start
+                written += 1
+                print(f"[{i}/{len(filepaths)}] ✓ {filename}")
+            else:
+                print(f"[{i}/{len(filepaths)}] - {filename}: unchanged")
+        except Exception as e:
+            errors += 1
+            print(f"[{i}/{len(filepaths)}] ✗ {filename}: Error - {str(e)[:100]}")
+
+    return timings, written, errors
+
+def main():
+    stage_names = [name for name, _ in STAGES]
+    parser = argparse.ArgumentParser(description='Run the article maintenance steps in a single pass')
+    parser.add_argument('files', nargs='*', help='articles to process (default: all of articles/)')
+    parser.add_argument('--stages', default=','.join(DEFAULT_STAGES),
+                        help=f'comma-separated stages to run, in order (default: {",".join(DEFAULT_STAGES)}; '
+                             f'also: {",".join(n for n in stage_names if n not in DEFAULT_STAGES)})')
+    parser.add_argument('--skip', default='', help='comma-separated stages to leave out')
+    args = parser.parse_args()
+
+    selected = [name.strip() for name in args.stages.split(',') if name.strip()]
+    skipped = {name.strip() for name in args.skip.split(',') if name.strip()}
+    unknown = [name for name in selected + list(skipped) if name not in stage_names]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    stages = select_stages(selected, skipped)
+
+    if args.files:
+        filepaths = args.files
+    else:
+        filepaths = sorted(os.path.join(ARTICLES_DIR, f) for f in os.listdir(ARTICLES_DIR) if f.endswith('.html'))
+
+    print(f"Running {len(stages)} stages ({', '.join(name for name, _ in stages)}) over {len(filepaths)} articles...\n")
+
+    start = time.perf_counter()
+    timings, written, errors = run_pipeline(filepaths, stages)
+    total = time.perf_counter() - start
+
+    print(f"\n{'='*60}")
+    print(f"Pipeline complete in {total:.2f}s")
+    print(f"  Files written: {written}/{len(filepaths)}")
+    print(f"  Errors: {errors}")
+    print(f"\nStage timings:")
+    for name, seconds in timings.items():
+        print(f"  {name:<15} {seconds:8.3f}s")
+
+if __name__ == '__main__':
+    main()
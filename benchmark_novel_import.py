@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Benchmark and regression-check the novel import engine
+
+Runs the Project Gutenberg header/footer filter and the chapter header check
+over every line of the given novels (default: all .txt files in NOVELS_DIR),
+once with the original per-pattern loops and once with the compiled
+combined regexes (behind a keyword prefilter for the skip patterns),
+reports lines/s and checks both classify every line the same way.
+
+Then splits each novel's merged paragraphs with the original
+split_long_paragraphs and with the single-pass segmenter and packer,
+reporting words/s, pieces produced and pieces that end on an abbreviation
+or initial ("Mr.", "St.", "J.") - splits in the middle of a sentence.
+
+Finally imports each novel with every strategy, reporting MB/s and how many
+paragraphs differ from a saved reference run. Save one with
+--save-reference before changing the engine, then rerun to see what the
+change did to each strategy's output.
+"""
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+from novel_import_engine import (ABBREVIATIONS, NOVELS_DIR, SKIP_PATTERNS, STRATEGIES, filter_lines,
+                                 is_chapter_header, is_skipped_line, merge_paragraphs, novel_paragraphs,
+                                 read_lines, split_long_paragraphs)
+
+REFERENCE_FILE = '.novel_import_reference.json'
+SECTIONS = ['rules', 'split', 'strategies']
+
+# The rules as they were before being combined, duplicate entries included
+LEGACY_SKIP_PATTERNS = SKIP_PATTERNS + [
+    r'posted with the authorization',
+    r'posted with the agreement',
+    r'posted with the consent',
+    r'posted with the permission',
+    r'posted with the authorization',
+    r'posted with the agreement',
+    r'posted with the consent',
+    r'posted with the permission',
+    r'posted with the authorization',
+    r'posted with the agreement',
+    r'posted with the consent',
+]
+
+def legacy_skip(line):
+    for pattern in LEGACY_SKIP_PATTERNS:
+        if re.search(pattern, line, re.IGNORECASE):
+            return True
+    return False
+
+def legacy_is_chapter_header(text):
+    patterns = [
+        r'^Chapter',
+        r'^CHAPTER',
+        r'^Ch\.?\s*\d+',
+        r'^[IVX]+\.?\s+',
+        r'^Part\s+\d+',
+        r'^PART\s+\d+',
+        r'^Section\s+\d+',
+        r'^VOLUME',
+        r'^Volume',
+        r'^Letter\s+\d+',
+        r'^Letter',
+        r'^Preface',
+        r'^Introduction',
+        r'^Epilogue',
+        r'^Conclusion',
+        r'^Appendix',
+        r'^Contents',
+        r'^Contents:',
+        r'^TITLE PAGE',
+        r'^TRANSCRIBER.*NOTE',
+        r'^PRODUCER.*NOTE',
+        r'^END OF',
+        r'^THE END',
+        r'^Footnotes?',
+        r'^Footnote',
+        r'^ILLUSTRATIONS?',
+        r'^LIST OF ILLUSTRATIONS'
+    ]
+
+    text_upper = text.upper()
+    for pattern in patterns:
+        if re.search(pattern, text_upper):
+            return True
+    return False
+
+def legacy_split_long_paragraphs(paragraphs, max_words=250):
+    result = []
+
+    for paragraph in paragraphs:
+        words = paragraph.split()
+
+        if len(words) <= max_words:
+            result.append(paragraph)
+        else:
+            sentences = re.split(r'([.!?。！？]["\']?\s+|[.!?。！？](?=\s*[A-Z]))', paragraph)
+
+            full_sentences = []
+            i = 0
+            while i < len(sentences):
+                if i + 1 < len(sentences) and sentences[i+1].strip():
+                    full_sentences.append(sentences[i] + sentences[i+1])
+                    i += 2
+                else:
+                    if sentences[i].strip():
+                        full_sentences.append(sentences[i])
+                    i += 1
+
+            current_chunk = []
+            current_word_count = 0
+
+            for sentence in full_sentences:
+                sentence_words = sentence.split()
+
+                if current_word_count + len(sentence_words) > max_words and current_chunk:
+                    result.append(' '.join(current_chunk).strip())
+                    current_chunk = [sentence]
+                    current_word_count = len(sentence_words)
+                else:
+                    current_chunk.append(sentence)
+                    current_word_count += len(sentence_words)
+
+            if current_chunk:
+                result.append(' '.join(current_chunk).strip())
+
+    return result
+
+def bad_splits(split, paragraphs):
+    """Pieces ending on an abbreviation or initial where a paragraph was split"""
+    count = 0
+    for paragraph in paragraphs:
+        for piece in split([paragraph])[:-1]:
+            word = piece.rsplit(' ', 1)[-1].lstrip('"\'“‘(').lower()
+            if word.endswith('.') and (word[:-1] in ABBREVIATIONS or len(word) == 2):
+                count += 1
+    return count
+
+def time_rule(rule, lines, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [rule(line) for line in lines]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return results, best
+
+def paragraph_digests(paragraphs):
+    return [hashlib.sha1(paragraph.encode('utf-8')).hexdigest()[:12] for paragraph, _ in paragraphs]
+
+def bench_line_rules(files, repeat):
+    print(f"{'novel':<28} {'lines':>7} {'rule':<15} {'before l/s':>11} {'after l/s':>11} {'speedup':>8} {'mismatches':>11}")
+    for filepath in files:
+        with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+            lines = [line.strip() for line in f if line.strip()]
+        name = os.path.splitext(os.path.basename(filepath))[0][:28]
+        for rule, before, after in [('skip patterns', legacy_skip, is_skipped_line),
+                                    ('chapter header', legacy_is_chapter_header, is_chapter_header)]:
+            expected, before_time = time_rule(before, lines, repeat)
+            got, after_time = time_rule(after, lines, repeat)
+            mismatches = sum(a != b for a, b in zip(expected, got))
+            print(f"{name:<28} {len(lines):>7} {rule:<15} {len(lines) / before_time:>11,.0f} "
+                  f"{len(lines) / after_time:>11,.0f} {before_time / after_time:>7.1f}x {mismatches:>11}")
+            name = ''
+
+def bench_splitters(files, repeat):
+    print(f"{'novel':<28} {'words':>8} {'splitter':<9} {'words/s':>11} {'pieces':>7} {'bad splits':>11}")
+    for filepath in files:
+        paragraphs = [paragraph for paragraph, _ in merge_paragraphs(filter_lines(read_lines(filepath)))]
+        words = sum(paragraph.count(' ') + 1 for paragraph in paragraphs)
+        name = os.path.splitext(os.path.basename(filepath))[0][:28]
+        for splitter, split in [('before', legacy_split_long_paragraphs), ('after', split_long_paragraphs)]:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                pieces = split(paragraphs)
+                timings.append(time.perf_counter() - start)
+            print(f"{name:<28} {words:>8} {splitter:<9} {words / min(timings):>11,.0f} {len(pieces):>7} "
+                  f"{bad_splits(split, paragraphs):>11}")
+            name = ''
+
+def bench_strategies(files, repeat, reference_path, save):
+    """Import every novel with every strategy; compare paragraph digests against the reference run"""
+    reference = {}
+    if os.path.exists(reference_path):
+        with open(reference_path, 'r', encoding='utf-8') as f:
+            reference = json.load(f)
+    results = {}
+
+    print(f"{'strategy':<12} {'novel':<28} {'MB/s':>6} {'paragraphs':>10} {'chapters':>8} {'changed':>13}")
+    for strategy in STRATEGIES:
+        results[strategy] = {}
+        for filepath in files:
+            size_mb = os.path.getsize(filepath) / (1024 * 1024)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                paragraphs = list(novel_paragraphs(filepath, strategy))
+                timings.append(time.perf_counter() - start)
+            name = os.path.basename(filepath)
+            digests = paragraph_digests(paragraphs)
+            results[strategy][name] = digests
+
+            expected = reference.get(strategy, {}).get(name)
+            if expected is None:
+                changed = '-'
+            else:
+                # Paragraphs gone from / new in the output, so one early change does not count for every later one
+                matcher = difflib.SequenceMatcher(None, expected, digests, autojunk=False)
+                matched = sum(block.size for block in matcher.get_matching_blocks())
+                removed, added = len(expected) - matched, len(digests) - matched
+                changed = f"-{removed}/+{added}" if removed or added else '0'
+            print(f"{strategy:<12} {os.path.splitext(name)[0][:28]:<28} {size_mb / min(timings):>6.1f} "
+                  f"{len(paragraphs):>10} {sum(starts for _, starts in paragraphs):>8} {changed:>13}")
+
+    if save:
+        with open(reference_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f)
+        print(f"\nSaved reference output to {reference_path}")
+    elif not reference:
+        print(f"\nNo reference output yet - run with --save-reference to record one")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark and regression-check the novel import engine')
+    parser.add_argument('files', nargs='*', help=f'novel .txt files (default: all in {NOVELS_DIR})')
+    parser.add_argument('--repeat', type=int, default=3, help='timing repetitions (best is reported)')
+    parser.add_argument('--only', choices=SECTIONS, action='append', help='run only these sections')
+    parser.add_argument('--reference', default=REFERENCE_FILE, help=f'reference output (default: {REFERENCE_FILE})')
+    parser.add_argument('--save-reference', action='store_true', help='record this run as the reference output')
+    args = parser.parse_args()
+
+    files = args.files
+    if not files:
+        if not os.path.exists(NOVELS_DIR):
+            print(f"❌ Error: Directory not found: {NOVELS_DIR}")
+            return 1
+        files = [os.path.join(NOVELS_DIR, f) for f in sorted(os.listdir(NOVELS_DIR)) if f.endswith('.txt')]
+
+    sections = args.only or SECTIONS
+    if 'rules' in sections:
+        bench_line_rules(files, args.repeat)
+        print()
+    if 'split' in sections:
+        bench_splitters(files, args.repeat)
+        print()
+    if 'strategies' in sections:
+        bench_strategies(files, args.repeat, args.reference, args.save_reference)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
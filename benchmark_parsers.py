@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML parser backends on the articles/ corpus
+
+Parses every file under articles/ with each installed backend, reports
+throughput, and checks that each backend extracts the same title and
+paragraph/heading text as the html.parser baseline.
+"""
+import os
+import sys
+import time
+
+from soup_parser import available_parsers, make_soup, PARSER
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+        HAS_SELECTOLAX = True
+    except ImportError:
+        HAS_SELECTOLAX = False
+
+ARTICLES_DIR = 'articles'
+TEXT_TAGS = ['p', 'h1', 'h2', 'h3', 'h4']
+
+def _normalize(text):
+    return ' '.join(text.split())
+
+def soup_signature(html, parser):
+    """Title plus (tag, text) of every paragraph/heading, via BeautifulSoup"""
+    soup = make_soup(html, parser)
+    title_tag = soup.find('title')
+    title = _normalize(title_tag.get_text()) if title_tag else ''
+    blocks = [(el.name, _normalize(el.get_text())) for el in soup.find_all(TEXT_TAGS)]
+    return title, blocks
+
+def selectolax_signature(html):
+    """Same signature as soup_signature, via selectolax (not a BeautifulSoup backend)"""
+    tree = SelectolaxParser(html)
+    title_node = tree.css_first('title')
+    title = _normalize(title_node.text()) if title_node else ''
+    blocks = [(node.tag, _normalize(node.text())) for node in tree.css(', '.join(TEXT_TAGS))]
+    return title, blocks
+
+def main():
+    files = sorted(f for f in os.listdir(ARTICLES_DIR) if f.endswith('.html'))
+    documents = []
+    for filename in files:
+        with open(os.path.join(ARTICLES_DIR, filename), 'r', encoding='utf-8') as f:
+            documents.append((filename, f.read()))
+    total_mb = sum(len(html.encode('utf-8')) for _, html in documents) / (1024 * 1024)
+
+    # html.parser goes first: it is always installed and defines the reference output
+    parsers = ['html.parser'] + [name for name in available_parsers() if name != 'html.parser']
+    backends = [(name, lambda html, name=name: soup_signature(html, name)) for name in parsers]
+    if HAS_SELECTOLAX:
+        backends.append(('selectolax', selectolax_signature))
+
+    print(f"Benchmarking {len(backends)} backends on {len(documents)} files ({total_mb:.1f} MB)")
+    print(f"make_soup() currently uses: {PARSER}\n")
+
+    baseline = None
+    print(f"{'backend':<12} {'seconds':>8} {'files/s':>9} {'MB/s':>7} {'mismatches':>11}")
+    for name, signature in backends:
+        start = time.perf_counter()
+        results = [signature(html) for _, html in documents]
+        elapsed = time.perf_counter() - start
+
+        if baseline is None:
+            baseline = results
+        mismatched = [filename for (filename, _), got, want in zip(documents, results, baseline) if got != want]
+
+        print(f"{name:<12} {elapsed:>8.2f} {len(documents) / elapsed:>9.1f} {total_mb / elapsed:>7.2f} {len(mismatched):>11}")
+        for filename in mismatched[:3]:
+            print(f"    differs: {filename}")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
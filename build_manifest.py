@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Build manifest for incremental article processing
+
+Records, for every file in articles/, its content hash, mtime and size, plus
+the outputs each processing step derived from it (title, tags, translation
+state, ...). A step's outputs are stored together with the hash of the file
+they were computed from, so a step can skip any article whose content has not
+changed since it last ran. Named indexes hold corpus-wide data that steps
+maintain incrementally (e.g. tag document frequencies).
+"""
+import hashlib
+import json
+import os
+
+MANIFEST_FILE = '.build_manifest.json'
+MANIFEST_VERSION = 1
+
+def file_digest(filepath):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class BuildManifest:
+    """Per-article content hashes and the outputs derived from them"""
+
+    def __init__(self, path=MANIFEST_FILE):
+        self.path = path
+        self.articles = {}
+        self.indexes = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.articles = data.get('articles', {})
+                    self.indexes = data.get('indexes', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable build manifest {path}: {e}")
+
+    def current_hash(self, filename, filepath):
+        """Content hash of an article, re-hashing only if its mtime or size changed"""
+        stat = os.stat(filepath)
+        entry = self.articles.get(filename)
+        if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry['hash']
+
+        digest = file_digest(filepath)
+        if not entry or entry['hash'] != digest:
+            # New content: outputs derived from the old content no longer apply
+            entry = {'stages': {}}
+            self.articles[filename] = entry
+        entry.update(hash=digest, mtime=stat.st_mtime_ns, size=stat.st_size)
+        return digest
+
+    def get_outputs(self, filename, filepath, stage):
+        """Outputs a stage recorded for the article's current content, or None if it must re-run"""
+        digest = self.current_hash(filename, filepath)
+        outputs = self.articles[filename]['stages'].get(stage)
+        if outputs is None or outputs.get('hash') != digest:
+            return None
+        return outputs
+
+    def set_outputs(self, filename, filepath, stage, **outputs):
+        """Record a stage's outputs against the article's current content (call after writing it)"""
+        digest = self.current_hash(filename, filepath)
+        self.articles[filename]['stages'][stage] = dict(outputs, hash=digest)
+
+    def index(self, name):
+        """Corpus-wide dict saved with the manifest, created empty on first use"""
+        return self.indexes.setdefault(name, {})
+
+    def prune(self, filenames):
+        """Forget articles that no longer exist"""
+        keep = set(filenames)
+        for filename in [f for f in self.articles if f not in keep]:
+            del self.articles[filename]
+
+    def save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'articles': self.articles, 'indexes': self.indexes}, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.path)
@@ -1,10 +1,17 @@
 #!/usr/bin/env python3
 """
 Check translation progress for articles
+
+Reads the status published by a running translate_articles.py; scans
+articles/ when no translator is running (or with --scan), since a status
+file left by an earlier run misses articles added after it.
 """
+import argparse
 import os
+from translation_progress import read_status, is_running
 
-def check_translation_progress():
+def scan_translation_progress():
+    """(translated_articles, total_articles) by searching every article for placeholders"""
     articles_dir = 'articles'
     files = [f for f in os.listdir(articles_dir) if f.endswith('.html')]
     
@@ -22,9 +29,26 @@ def check_translation_progress():
         except Exception as e:
             print(f"Error reading {filename}: {e}")
     
+    return translated_articles, total_articles
+
+def check_translation_progress(scan=False):
+    status = None if scan else read_status()
+    if is_running(status):
+        total_articles = status['articles_total']
+        translated_articles = total_articles - status['articles_remaining']
+        print("Translator: running")
+        print(f"Paragraphs: {status['done']}/{status['paragraphs_total']} translated, "
+              f"{status['pending']} pending, {status['failed']} failed")
+    else:
+        if status:
+            print(f"Translator: not running (last run {status['state']}), scanning articles/")
+        translated_articles, total_articles = scan_translation_progress()
+    
     print(f"Total articles: {total_articles}")
     print(f"Translated articles: {translated_articles}/{total_articles}")
     print(f"Progress: {translated_articles/total_articles*100:.1f}%" if total_articles > 0 else "0%")
 
 if __name__ == '__main__':
-    check_translation_progress()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Check translation progress for articles')
+    parser.add_argument('--scan', action='store_true', help='scan articles/ instead of reading the status file')
+    check_translation_progress(parser.parse_args().scan)
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for fetch_news.py
+
+Raw response bodies are stored once per content hash under bodies/, and
+index.json maps each URL to the hash of its latest body plus the article
+record extracted from it. Entries younger than the TTL are served without a
+request; older ones are revalidated and, if not refreshed, expire. The least
+recently used entries are evicted once the cache grows past its size limit.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+CACHE_DIR = '.fetch_cache'
+CACHE_TTL = 7 * 24 * 3600            # Seconds a cached page is used without contacting the server
+CACHE_MAX_BYTES = 200 * 1024 * 1024  # Total size of stored bodies before LRU eviction
+
+def content_hash(body):
+    """Hash used to address a response body"""
+    return hashlib.sha256(body).hexdigest()
+
+class FetchCache:
+    """URL + content hash keyed cache of raw HTML and extracted article records"""
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=CACHE_TTL, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.bodies_dir = os.path.join(cache_dir, 'bodies')
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.index = {}
+
+        os.makedirs(self.bodies_dir, exist_ok=True)
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable cache index {self.index_path}: {e}")
+
+    def _body_path(self, digest):
+        return os.path.join(self.bodies_dir, digest + '.html')
+
+    def _is_fresh(self, entry, now):
+        return self.ttl is None or now - entry['fetched_at'] <= self.ttl
+
+    def get(self, url, allow_stale=False):
+        """Return the cached {'hash', 'item', ...} entry for url, or None"""
+        now = time.time()
+        with self._lock:
+            entry = self.index.get(url)
+            if not entry or not (allow_stale or self._is_fresh(entry, now)):
+                return None
+            entry['last_access'] = now
+            return entry
+
+    def get_body(self, url):
+        """Return the raw body last stored for url, or None"""
+        entry = self.get(url, allow_stale=True)
+        if not entry:
+            return None
+        try:
+            with open(self._body_path(entry['hash']), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def touch(self, url):
+        """Mark url as revalidated (e.g. after a 304) so its TTL starts over"""
+        now = time.time()
+        with self._lock:
+            entry = self.index.get(url)
+            if entry:
+                entry['fetched_at'] = now
+                entry['last_access'] = now
+
+    def put(self, url, body, item):
+        """Store body (once per content hash) and the record extracted from it"""
+        digest = content_hash(body)
+        path = self._body_path(digest)
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+
+        now = time.time()
+        with self._lock:
+            self.index[url] = {
+                'hash': digest,
+                'size': len(body),
+                'fetched_at': now,
+                'last_access': now,
+                'item': item
+            }
+        return digest
+
+    def evict(self):
+        """Drop expired entries, then least recently used ones until under max_bytes"""
+        now = time.time()
+        with self._lock:
+            for url in [u for u, e in self.index.items() if not self._is_fresh(e, now)]:
+                del self.index[url]
+
+            # Bodies are shared between URLs with identical content, count each once
+            sizes = {}
+            for entry in self.index.values():
+                sizes[entry['hash']] = entry['size']
+            total = sum(sizes.values())
+
+            for url, entry in sorted(self.index.items(), key=lambda kv: kv[1]['last_access']):
+                if total <= self.max_bytes:
+                    break
+                del self.index[url]
+                if not any(e['hash'] == entry['hash'] for e in self.index.values()):
+                    total -= sizes.pop(entry['hash'], 0)
+
+            live_hashes = {e['hash'] for e in self.index.values()}
+
+        # Remove bodies no longer referenced by any URL
+        removed = 0
+        for name in os.listdir(self.bodies_dir):
+            digest, ext = os.path.splitext(name)
+            if ext == '.html' and digest not in live_hashes:
+                os.remove(os.path.join(self.bodies_dir, name))
+                removed += 1
+        return removed
+
+    def save(self):
+        """Evict, then write the index atomically"""
+        self.evict()
+        with self._lock:
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False)
+            os.replace(tmp_path, self.index_path)
@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import re
 from collections import defaultdict
-from bs4 import BeautifulSoup
+from soup_parser import make_soup
+from webnovels_index import write_index_and_shell
+
+parser = argparse.ArgumentParser(description='Generate a clean webnovels page from unique_articles.txt')
+parser.add_argument('--json', action='store_true',
+                    help='write the article list to webnovels_index.json and a shell page that renders it')
+parser.add_argument('--compress', action='store_true', help='with --json, also write precompressed .gz/.br copies')
+args = parser.parse_args()
 
 # Read unique articles list
 with open('unique_articles.txt', 'r') as f:
@@ -12,7 +20,7 @@ print(f"Processing {len(unique_files)} unique articles...")
 
 # Read the original webnovels.html to extract article metadata
 with open('webnovels.html', 'r', encoding='utf-8') as f:
-    soup = BeautifulSoup(f.read(), 'html.parser')
+    soup = make_soup(f.read())
 
 # Extract existing article data (title and tags) from the original file
 article_data = {}
@@ -29,6 +37,7 @@ for article in soup.find_all('div', class_='webnovel-article'):
 
 # Generate the articles HTML
 articles_html = []
+articles_data = []
 for filename in sorted(unique_files):
     if filename in article_data:
         data = article_data[filename]
@@ -36,6 +45,7 @@ for filename in sorted(unique_files):
         # Create default data for new files
         title = filename.replace('.html', '').replace('_', ' ').title()
         data = {'title': title, 'tags': 'ai'}
+    articles_data.append({'filename': filename, 'title': data['title'], 'tags': data['tags']})
     
     tags_list = data['tags'].split()
     tags_html = ' '.join([f'<span class="article-tag">{tag}</span>' for tag in tags_list])
@@ -106,8 +116,10 @@ new_html = header + '\n' + '\n'.join(articles_html) + '''
 </html>'''
 
 # Write the new clean webnovels.html
-with open('webnovels_new.html', 'w', encoding='utf-8') as f:
-    f.write(new_html)
-
-print("Generated webnovels_new.html successfully!")
+if args.json:
+    write_index_and_shell(articles_data, 'webnovels_new.html', compress=args.compress)
+else:
+    with open('webnovels_new.html', 'w', encoding='utf-8') as f:
+        f.write(new_html)
+    print("Generated webnovels_new.html successfully!")
 print("Review the file and then rename it to webnovels.html to replace the old version.")
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Compiled keyword tagger
+
+Builds one Aho–Corasick automaton over word tokens from the keyword tables,
+so tagging an article is a single pass over its words however many keywords
+there are. Matching on tokens gives word boundaries for free: 'mit' no
+longer matches inside 'submit', nor 'law' inside 'flaw'.
+
+Two kinds of keyword:
+- whole words / phrases ('openai', 'data center'), also matching plurals and
+  possessives ('data centers', "google's")
+- stems ('robot', 'regulation'), matching any word that starts with them
+  ('robotics', 'regulations'). Stems shorter than MIN_STEM_CHARS are
+  matched as whole words instead ('law' would match 'lawn', 'work'
+  'workshop'), so their inflections need listing.
+
+DocumentFrequencies and rank_tags pick an article's most relevant tags by
+TF-IDF weight, with document frequencies kept up to date one article at a
+time.
+
+Run `python keyword_tagger.py --bench` to compare against substring search
+on the current corpus.
+"""
+import argparse
+import math
+import os
+import re
+import time
+from collections import Counter, deque
+
+MATCHER_VERSION = 2  # Part of the tag cache key in add_tags_and_pagination.py
+MIN_STEM_CHARS = 5   # Shorter stems only match whole words
+
+WORD_RE = re.compile(r"[a-z0-9]+(?:['’][a-z0-9]+)*")
+SUFFIXES = ("'s", "’s", 'es', 's')
+
+def tokenize(text):
+    """Lowercase word tokens of text; hyphenated words are split ('coca-cola' is a two-word phrase)"""
+    return WORD_RE.findall(text.lower())
+
+class KeywordTagger:
+    """Aho–Corasick automaton over word tokens mapping keyword hits to tags"""
+
+    def __init__(self, keywords, stems=None):
+        """keywords: {phrase: tag} matched as whole words; stems: {stem: tag} matched at word starts
+
+        Stems shorter than MIN_STEM_CHARS are matched as whole words.
+        """
+        stems = stems or {}
+        self.goto = [{}]       # Per state: symbol -> next state
+        self.fail = [0]
+        self.output = [[]]     # Per state: (phrase, tag) matches ending here
+        self.vocabulary = set()
+        self.stems = {}
+        self._symbols = {}     # Token -> symbol cache
+
+        for phrase, tag in keywords.items():
+            self._add(tokenize(phrase), phrase, tag)
+        for stem, tag in stems.items():
+            tokens = tokenize(stem)
+            if len(tokens) == 1 and len(tokens[0]) >= MIN_STEM_CHARS:
+                self.stems[tokens[0]] = tokens[0]
+            self._add(tokens, stem, tag)
+        self.stem_lengths = sorted({len(stem) for stem in self.stems}, reverse=True)
+        self._build_failure_links()
+
+    def _add(self, tokens, phrase, tag):
+        state = 0
+        for token in tokens:
+            self.vocabulary.add(token)
+            if token not in self.goto[state]:
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+                self.goto[state][token] = len(self.goto) - 1
+            state = self.goto[state][token]
+        self.output[state].append((phrase, tag))
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for symbol, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and symbol not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(symbol, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def symbol(self, token):
+        """Keyword vocabulary entry a token stands for, or None"""
+        if token in self._symbols:
+            return self._symbols[token]
+        symbol = None
+        if token in self.vocabulary:
+            symbol = token
+        else:
+            for suffix in SUFFIXES:
+                if token.endswith(suffix) and token[:-len(suffix)] in self.vocabulary:
+                    symbol = token[:-len(suffix)]
+                    break
+            else:
+                for length in self.stem_lengths:
+                    if token[:length] in self.stems:
+                        symbol = token[:length]
+                        break
+        self._symbols[token] = symbol
+        return symbol
+
+    def matches(self, tokens):
+        """Yield (phrase, tag) for every keyword occurrence in a token sequence"""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for token in tokens:
+            symbol = self.symbol(token)
+            if symbol is None:
+                state = 0
+                continue
+            while state and symbol not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(symbol, 0)
+            yield from output[state]
+
+    def count_tags(self, text):
+        """Counter of tag -> number of keyword hits in text"""
+        return Counter(tag for _, tag in self.matches(tokenize(text)))
+
+class DocumentFrequencies:
+    """Number of documents each tag occurs in, updated one document at a time
+
+    store is a plain dict (e.g. BuildManifest.index('tag_df')) holding the tag
+    set of every document counted, so a changed or deleted document can be
+    taken back out without rescanning the others.
+    """
+
+    def __init__(self, store):
+        self.docs = store.setdefault('docs', {})  # Document -> its tags
+        self.df = store.setdefault('df', {})      # Tag -> number of documents
+
+    def __contains__(self, doc):
+        return doc in self.docs
+
+    def __len__(self):
+        return len(self.docs)
+
+    def update(self, doc, tags):
+        """Count doc as having tags, replacing whatever it was counted with before"""
+        self.remove(doc)
+        self.docs[doc] = sorted(set(tags))
+        for tag in self.docs[doc]:
+            self.df[tag] = self.df.get(tag, 0) + 1
+
+    def remove(self, doc):
+        for tag in self.docs.pop(doc, []):
+            self.df[tag] -= 1
+            if not self.df[tag]:
+                del self.df[tag]
+
+    def prune(self, docs):
+        """Forget documents not in docs"""
+        keep = set(docs)
+        for doc in [d for d in self.docs if d not in keep]:
+            self.remove(doc)
+
+    def idf(self, tag):
+        """Smoothed inverse document frequency: rare tags weigh more"""
+        return math.log((1 + len(self.docs)) / (1 + self.df.get(tag, 0))) + 1
+
+def rank_tags(counts, frequencies, limit):
+    """The limit tags with the highest TF-IDF weight, most relevant first
+
+    counts maps tag -> hits in the document; term frequency is damped
+    logarithmically so one name repeated throughout does not drown out
+    everything else.
+    """
+    scores = {tag: (1 + math.log(hits)) * frequencies.idf(tag) for tag, hits in counts.items() if hits}
+    return sorted(scores, key=lambda tag: (-scores[tag], tag))[:limit]
+
+def _corpus_texts(articles_dir='articles'):
+    from soup_parser import make_soup
+    texts = []
+    for filename in sorted(os.listdir(articles_dir)):
+        if filename.endswith('.html'):
+            with open(os.path.join(articles_dir, filename), 'r', encoding='utf-8') as f:
+                texts.append((filename, make_soup(f.read()).get_text().lower()))
+    return texts
+
+def benchmark(repeat, scale):
+    from add_tags_and_pagination import COMPANY_KEYWORDS, TOPIC_KEYWORDS, TAGGER
+    keywords = {**COMPANY_KEYWORDS, **TOPIC_KEYWORDS}
+    texts = _corpus_texts()
+    if scale > 1:
+        # Pad the tables with keywords that never occur, to show how each approach grows
+        padding = {f"{keyword}{i}x": tag for i in range(1, scale) for keyword, tag in COMPANY_KEYWORDS.items()}
+        keywords.update(padding)
+        TAGGER = KeywordTagger({**COMPANY_KEYWORDS, **padding}, stems=TOPIC_KEYWORDS)
+    print(f"Corpus: {len(texts)} articles, {sum(len(t) for _, t in texts) / 1e6:.1f}M characters, "
+          f"{len(keywords)} keywords\n")
+
+    def substring_tags(text):
+        return {tag for keyword, tag in keywords.items() if keyword in text}
+
+    def automaton_tags(text):
+        return set(TAGGER.count_tags(text))
+
+    results = {}
+    for name, tag in [('substring', substring_tags), ('automaton', automaton_tags)]:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            results[name] = [tag(text) for _, text in texts]
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f"{name:<10} {elapsed * 1000:8.1f} ms  ({len(texts) / elapsed:7.0f} articles/s)")
+
+    dropped = Counter()
+    added = Counter()
+    for old, new in zip(results['substring'], results['automaton']):
+        dropped.update(old - new)
+        added.update(new - old)
+    print(f"\nTags no longer assigned (substring-only hits): {sum(dropped.values())}")
+    for tag, count in dropped.most_common(10):
+        print(f"  {tag:<12} {count}")
+    print(f"Tags newly assigned: {sum(added.values())}")
+    for tag, count in added.most_common(10):
+        print(f"  {tag:<12} {count}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Compiled keyword tagger')
+    parser.add_argument('--bench', action='store_true', help='benchmark against substring search on articles/')
+    parser.add_argument('--repeat', type=int, default=5, help='timing repetitions')
+    parser.add_argument('--scale', type=int, default=1, help='multiply the company keyword table (with unused entries)')
+    args = parser.parse_args()
+
+    if args.bench:
+        benchmark(args.repeat, args.scale)
+    else:
+        parser.print_help()
+
+if __name__ == '__main__':
+    main()
@@ -1,37 +1,61 @@
 #!/usr/bin/env python3
 """
 Monitor translation progress and notify when complete
+
+Follows the event log published by translate_articles.py, showing paragraph
+progress, throughput and ETA as updates arrive. With --scan (or when no
+translator has reported yet) it falls back to rescanning articles/ every
+30 seconds.
 """
-import os
+import argparse
 import time
-import subprocess
+from collections import deque
+from check_translation_progress import scan_translation_progress
+from translation_progress import read_status, is_running, follow_events
 
-def check_translation_progress():
-    articles_dir = 'articles'
-    files = [f for f in os.listdir(articles_dir) if f.endswith('.html')]
-    
-    total_articles = len(files)
-    translated_articles = 0
-    
-    for filename in files:
-        filepath = os.path.join(articles_dir, filename)
-        try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                content = file.read()
-                # Check if translation placeholders still exist
-                if '[翻译占位 - Translation placeholder]' not in content:
-                    translated_articles += 1
-        except Exception as e:
-            print(f"Error reading {filename}: {e}")
-    
-    return translated_articles, total_articles
+RATE_WINDOW = 60  # Seconds of updates the throughput is averaged over
 
-def main():
-    print("🔄 Starting translation progress monitoring...")
-    print("This script will check every 30 seconds until all articles are translated.")
+def format_duration(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    return f"{seconds // 60}m{seconds % 60:02d}s"
+
+def monitor_events():
+    """Tail the translator's event log; returns the final status"""
+    status = read_status()
+    window = deque([(status['updated'], status['done'])])
     
+    for event in follow_events():
+        if event is None:
+            if not is_running(status):
+                break  # Translator stopped without a final event
+            continue
+        
+        status = event
+        window.append((event['updated'], event['done']))
+        while len(window) > 2 and event['updated'] - window[0][0] > RATE_WINDOW:
+            window.popleft()
+        
+        elapsed = window[-1][0] - window[0][0]
+        rate = (window[-1][1] - window[0][1]) / elapsed if elapsed > 0 else 0
+        eta = format_duration(event['pending'] / rate) if rate > 0 else '--'
+        total = event['paragraphs_total']
+        progress = event['done'] / total * 100 if total else 100
+        articles_done = event['articles_total'] - event['articles_remaining']
+        
+        print(f"\r📊 Paragraphs: {event['done']}/{total} ({progress:.1f}%) | "
+              f"{rate:.1f} paragraphs/s | ETA {eta} | "
+              f"articles {articles_done}/{event['articles_total']} | failed {event['failed']}   ",
+              end="", flush=True)
+        
+        if event['state'] != 'running':
+            break
+    return status
+
+def monitor_scan():
     while True:
-        translated, total = check_translation_progress()
+        translated, total = scan_translation_progress()
         progress = (translated / total * 100) if total > 0 else 0
         
         print(f"\r📊 Translation progress: {translated}/{total} articles ({progress:.1f}%)", end="", flush=True)
@@ -44,8 +68,30 @@ def main():
         
         # Wait 30 seconds before next check
         time.sleep(30)
+
+def main():
+    parser = argparse.ArgumentParser(description='Monitor translation progress')
+    parser.add_argument('--scan', action='store_true', help='rescan articles/ every 30 seconds instead of tailing')
+    args = parser.parse_args()
+    
+    print("🔄 Starting translation progress monitoring...")
+    status = None if args.scan else read_status()
+    if not is_running(status):
+        if not args.scan:
+            print("No running translator is publishing progress, scanning articles/ instead.")
+        print("This script will check every 30 seconds until all articles are translated.")
+        monitor_scan()
+    else:
+        status = monitor_events()
+        if status['state'] == 'finished' and status['pending'] == 0 and status['failed'] == 0:
+            print(f"\n\n🎉 SUCCESS! All {status['articles_total']} articles have been translated!")
+            print("✅ Translation process completed.")
+            print("🌐 You can now view all articles with full Chinese translations.")
+        else:
+            print(f"\n\n⚠️  Translator stopped ({status['state']}): "
+                  f"{status['pending']} paragraphs pending, {status['failed']} failed. Run translate_articles.py to resume.")
     
     print("\n✅ Monitoring completed.")
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+"""
+Novel import engine: txt files to the novel reader's data files
+
+A novel is read as a stream of lines passed through the stages of one of
+the import strategies:
+- lines: every line of text is a paragraph (import_novels.py)
+- merge: lines are merged into paragraphs, with chapter headers on their own
+  (import_novels_v2.py)
+- merge_split: merged paragraphs are split at sentence boundaries into pieces
+  of at most 250 words (import_novels_v3.py)
+
+The import scripts are thin wrappers selecting a strategy; rules, compiled
+regexes and output writers all live here.
+
+With --chunked, complete novels are written as JSON chunks under novels_data/
+(cut at chapter boundaries) and novels_data.js only holds a small index, so
+the reader fetches just the part of a book being read.
+
+Either way each novel comes with a chapter table (title, first paragraph,
+word count and, for chunks, where the chapter starts in them), so the reader
+can jump straight to a chapter.
+"""
+import argparse
+import itertools
+import os
+import re
+import json
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+# Novel files location
+NOVELS_DIR = os.path.expanduser('~/Desktop/Novels')
+OUTPUT_FILE = 'novels_data.js'
+CHUNK_DIR = 'novels_data'
+MAX_PARAGRAPHS = 2000          # Per novel when everything is inlined in OUTPUT_FILE
+CHUNK_MIN_PARAGRAPHS = 50      # Short chapters share a chunk with the next ones
+CHUNK_MAX_PARAGRAPHS = 300     # Long chapters are cut into several chunks
+
+# Novel metadata (Chinese names)
+NOVEL_META = {
+    "Jane Eyre": {
+        "author": "Charlotte Brontë",
+        "chinese_name": "简·爱"
+    },
+    "Pride and Prejudice": {
+        "author": "Jane Austen",
+        "chinese_name": "傲慢与偏见"
+    },
+    "Moby Dick": {
+        "author": "Herman Melville",
+        "chinese_name": "白鲸"
+    },
+    "The Count of Monte Cristo": {
+        "author": "Alexandre Dumas",
+        "chinese_name": "基督山伯爵"
+    },
+    "Gulliver's Travels into Several Remote Nations of the World": {
+        "author": "Jonathan Swift",
+        "chinese_name": "格列佛游记",
+        "short_name": "Gulliver's Travels"
+    },
+    "The Railway Children": {
+        "author": "E. Nesbit",
+        "chinese_name": "铁路少年"
+    }
+}
+
+def clean_text(text):
+    """Clean text but preserve sentence structure"""
+    # Remove excessive whitespace but preserve sentence flow
+    text = ' '.join(text.split())
+    return text
+
+# Checked against the upper-cased text
+CHAPTER_HEADER_PATTERNS = [
+    r'^Chapter',
+    r'^CHAPTER',
+    r'^Ch\.?\s*\d+',
+    r'^[IVX]+\.?\s+',
+    r'^Part\s+\d+',
+    r'^PART\s+\d+',
+    r'^Section\s+\d+',
+    r'^VOLUME',
+    r'^Volume',
+    r'^Letter\s+\d+',
+    r'^Letter',
+    r'^Preface',
+    r'^Introduction',
+    r'^Epilogue',
+    r'^Conclusion',
+    r'^Appendix',
+    r'^Contents',
+    r'^Contents:',
+    r'^TITLE PAGE',
+    r'^TRANSCRIBER.*NOTE',
+    r'^PRODUCER.*NOTE',
+    r'^END OF',
+    r'^THE END',
+    r'^Footnotes?',
+    r'^Footnote',
+    r'^ILLUSTRATIONS?',
+    r'^LIST OF ILLUSTRATIONS'
+]
+
+# One alternation instead of a search per pattern; every pattern is anchored,
+# so a match at the start is all that needs trying
+CHAPTER_HEADER_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in CHAPTER_HEADER_PATTERNS))
+
+def is_chapter_header(text):
+    """Check if text is a chapter header"""
+    return CHAPTER_HEADER_RE.match(text.upper()) is not None
+
+# Sentence end: terminal punctuation and closing quotes/brackets, followed by
+# a space and something that can start a sentence
+SENTENCE_END_RE = re.compile(r'[.!?。！？]+["\'”’)\]]*(?= ["\'“‘(\[]?[A-Z0-9])')
+
+# Words whose trailing period does not end a sentence ("Mr. Rochester", "St. Petersburg");
+# single letters (initials) are handled separately
+ABBREVIATIONS = {
+    'mr', 'mrs', 'ms', 'messrs', 'mme', 'mlle', 'dr', 'st', 'mt', 'sr', 'jr', 'esq', 'rev', 'hon', 'prof',
+    'capt', 'col', 'gen', 'lieut', 'sgt', 'vol', 'ch', 'viz', 'i.e', 'e.g',
+}
+MAX_ABBREVIATION_CHARS = max(map(len, ABBREVIATIONS)) + 2  # Allowing for opening quotes or brackets
+
+def segment_sentences(text):
+    """Yield (start, end, word count) spans of the sentences in single-spaced text (as from clean_text)
+
+    One scan for sentence ends; words are counted from the spaces between
+    them, without splitting the text.
+    """
+    start = 0
+    for match in SENTENCE_END_RE.finditer(text):
+        period, end = match.span()
+        if end - period == 1 and text[period] == '.':
+            word_start = text.rfind(' ', 0, period) + 1
+            if period - word_start <= MAX_ABBREVIATION_CHARS:  # Longer words cannot be abbreviations
+                word = text[word_start:period].lstrip('"\'“‘(').lower()
+                if word in ABBREVIATIONS or len(word) == 1:
+                    continue
+        yield start, end, text.count(' ', start, end) + 1
+        start = end + 1
+    if start < len(text):
+        yield start, len(text), text.count(' ', start) + 1
+
+def pack_sentences(text, spans, max_words=250):
+    """Group sentence spans into pieces of text of at most max_words (a longer sentence stays whole)"""
+    chunk_start = chunk_end = None
+    chunk_words = 0
+    for start, end, words in spans:
+        if chunk_start is not None and chunk_words + words > max_words:
+            yield text[chunk_start:chunk_end]
+            chunk_start = None
+        if chunk_start is None:
+            chunk_start, chunk_words = start, 0
+        chunk_end = end
+        chunk_words += words
+    if chunk_start is not None:
+        yield text[chunk_start:chunk_end]
+
+def split_long_paragraphs(paragraphs, max_words=250):
+    """Split long paragraphs into smaller ones while preserving sentence boundaries"""
+    result = []
+    for paragraph in paragraphs:
+        if paragraph.count(' ') < max_words:  # At most max_words words: nothing to split
+            result.append(paragraph)
+        else:
+            result.extend(pack_sentences(paragraph, segment_sentences(paragraph), max_words))
+    return result
+
+# Common Project Gutenberg header/footer content
+BOILERPLATE_PATTERNS = [
+    r'Project Gutenberg',
+    r'gutenberg\.org',
+    r'END OF.*PROJECT GUTENBERG',
+    r'START OF.*PROJECT GUTENBERG',
+    r'\*\*\* (START|END)',
+    r'Produced by',
+    r'eBook',
+    r'ebook',
+]
+
+# File metadata lines, also dropped by the merging strategies
+METADATA_PATTERNS = [
+    r'Available from',
+    r'language:.*en',
+    r'character set encoding:.*utf-8',
+    r'encoding:.*utf-8',
+    r'last updated',
+    r'created on',
+    r'posted to',
+    r'last modified',
+    r'posted with permission',
+    r'posted with the permission',
+    r'posted with the consent',
+    r'posted with the authorization',
+    r'posted with the agreement',
+]
+SKIP_PATTERNS = BOILERPLATE_PATTERNS + METADATA_PATTERNS
+
+# Every pattern contains one of its group's keywords (lowercase), so lines
+# without any of them need no regex search at all
+BOILERPLATE_KEYWORDS = ('gutenberg', '*** ', 'produced by', 'ebook')
+SKIP_KEYWORDS = BOILERPLATE_KEYWORDS + ('available from', 'language:', 'encoding:', 'last updated', 'created on',
+                                        'posted ', 'last modified')
+
+class LineRule:
+    """Case-insensitive search for any of several patterns, behind a keyword prefilter"""
+
+    def __init__(self, patterns, keywords):
+        self.regex = re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
+        self.keywords = keywords
+
+    def __call__(self, line):
+        # The keyword check is only exact for ASCII: IGNORECASE also matches some
+        # non-ASCII letters to ASCII ones (e.g. the long s to 's')
+        if line.isascii():
+            line_lower = line.lower()
+            for keyword in self.keywords:
+                if keyword in line_lower:
+                    break
+            else:
+                return False
+        return self.regex.search(line) is not None
+
+is_boilerplate = LineRule(BOILERPLATE_PATTERNS, BOILERPLATE_KEYWORDS)
+is_skipped_line = LineRule(SKIP_PATTERNS, SKIP_KEYWORDS)
+
+# Short lines that start a new paragraph: all caps, roman numerals, or a number with period
+SECTION_BREAK_RE = re.compile(r'^[A-Z][A-Z ]+$|^[IVX]+$|^\d+\.$')
+
+# A paragraph running this long without a break is cut at a line boundary, so a
+# book without recognisable chapter headers cannot end up as one huge string
+MAX_MERGE_CHARS = 200_000
+
+# The importer is a pipeline of generators (read_lines, then the stages of a
+# strategy in STRATEGIES), so only the paragraph being merged (and, with
+# --chunked, the chunk being filled) is held in memory
+
+def read_lines(filepath):
+    """Stripped, non-empty lines of a text file"""
+    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+def filter_lines(lines):
+    """Drop Project Gutenberg header/footer and file metadata lines"""
+    for line in lines:
+        if not is_skipped_line(line):
+            yield line
+
+def merge_paragraphs(lines):
+    """Group lines into paragraphs with intelligent merging; yields (paragraph, is_chapter_header)"""
+    current_lines = []
+    current_chars = 0
+    
+    def finish_paragraph():
+        cleaned_para = clean_text(' '.join(current_lines))
+        if len(cleaned_para) > 50:  # Only add substantial paragraphs
+            yield cleaned_para, False
+    
+    for line in lines:
+        # Skip if line is a chapter header
+        if is_chapter_header(line):
+            # If we have accumulated text, save it as a paragraph
+            if current_lines:
+                yield from finish_paragraph()
+            
+            # Add the chapter header as a separate paragraph
+            yield clean_text(line), True
+            current_lines = []
+            current_chars = 0
+            continue
+        
+        # Check if this line starts a new paragraph based on formatting
+        # Lines that are short and look like section headers
+        is_new_paragraph = len(line) < 100 and SECTION_BREAK_RE.match(line) is not None
+        
+        # If this is a new paragraph (or the current one is overlong), save the accumulated text
+        if (is_new_paragraph or current_chars > MAX_MERGE_CHARS) and current_lines:
+            yield from finish_paragraph()
+            current_lines = []
+            current_chars = 0
+        
+        # Append to current paragraph
+        current_lines.append(line)
+        current_chars += len(line) + 1
+    
+    # Don't forget the last paragraph
+    if current_lines:
+        yield from finish_paragraph()
+
+def line_paragraphs(lines):
+    """Every substantial line as a paragraph of its own; yields (paragraph, False)"""
+    for line in lines:
+        # Skip very short lines (likely formatting artifacts) and header/footer content
+        text = clean_text(line)
+        if len(text) >= 50 and not is_boilerplate(text):
+            yield text, False
+
+def split_paragraphs(paragraphs, max_words=250):
+    """Split long paragraphs; yields (paragraph, starts_chapter)"""
+    for paragraph, is_header in paragraphs:
+        for i, part in enumerate(split_long_paragraphs([paragraph], max_words)):
+            yield part, is_header and i == 0
+
+# Strategy name -> stages applied in turn to the stream of lines, plus how the
+# wrapper script describes itself
+STRATEGIES = {
+    'lines': {
+        'stages': (line_paragraphs,),
+        'script': 'import_novels.py',
+        'note': None,
+        'intro': "🔄 Importing novels from txt files...",
+        'processed': "Extracted {count} paragraphs",
+        'outro': "🎉 Import complete!",
+    },
+    'merge': {
+        'stages': (filter_lines, merge_paragraphs),
+        'script': 'import_novels_v2.py',
+        'note': "Improved version: Merged related paragraphs for better reading experience",
+        'intro': "🔄 Importing novels from txt files with improved paragraph merging...",
+        'processed': "Merged into {count} coherent paragraphs",
+        'outro': "🎉 Import complete! Paragraphs have been merged for better reading experience.",
+    },
+    'merge_split': {
+        'stages': (filter_lines, merge_paragraphs, split_paragraphs),
+        'script': 'import_novels_v3.py',
+        'note': "Improved version: Merged related paragraphs for better reading experience + split long paragraphs",
+        'intro': "🔄 Importing novels from txt files with improved paragraph merging and long paragraph splitting...",
+        'processed': "Merged into {count} coherent paragraphs (with long paragraphs split)",
+        'outro': "🎉 Import complete! Paragraphs have been merged for better reading experience "
+                 "and long paragraphs have been split.",
+    },
+}
+DEFAULT_STRATEGY = 'merge_split'
+
+def novel_paragraphs(filepath, strategy=DEFAULT_STRATEGY):
+    """(paragraph, starts_chapter) pairs of a novel file, read lazily"""
+    stream = read_lines(filepath)
+    for stage in STRATEGIES[strategy]['stages']:
+        stream = stage(stream)
+    return stream
+
+def novel_info(filepath):
+    """Metadata of a novel file"""
+    filename = os.path.basename(filepath)
+    title = os.path.splitext(filename)[0]
+    
+    # Get metadata
+    meta = NOVEL_META.get(title, {
+        "author": "Unknown Author",
+        "chinese_name": title
+    })
+    
+    # Create novel ID (safe for JavaScript)
+    novel_id = title.lower().replace("'", "").replace(" ", "_")
+    novel_id = re.sub(r'[^a-z0-9_]', '', novel_id)
+    
+    return {
+        'id': novel_id,
+        'title': meta.get('short_name', title),
+        'author': meta['author'],
+        'chinese_name': meta['chinese_name']
+    }
+
+# Headers that name a chapter, for the chapter table. is_chapter_header also
+# matches ordinary lines starting with "I " or "The end"; these still break
+# paragraphs but are not listed as chapters
+CHAPTER_TITLE_RE = re.compile(
+    r'^(?:CHAPTER|LETTER|PART|VOLUME|BOOK|SECTION|PREFACE|INTRODUCTION|PROLOGUE|EPILOGUE|CONCLUSION|APPENDIX)\b'
+    r'|^[IVXLC]+\.(?:\s|$)', re.IGNORECASE)
+MAX_CHAPTER_TITLE_CHARS = 80
+
+def is_chapter_title(text):
+    """Whether a chapter header paragraph names a chapter (all capitals, or a chapter word or numeral first)"""
+    return text == text.upper() or CHAPTER_TITLE_RE.match(text) is not None
+
+class ChapterTable:
+    """Chapters of a novel, collected as its paragraphs stream past
+
+    Each chapter is [title, first paragraph, words], followed by whatever
+    location the caller passes (the chunk and byte offset for chunked output).
+    Paragraphs before the first chapter (title page, front matter) belong to
+    no chapter.
+    """
+
+    def __init__(self):
+        self.chapters = []
+
+    def add(self, paragraph, index, starts_chapter, *location):
+        if starts_chapter and is_chapter_title(paragraph):
+            self.chapters.append([paragraph[:MAX_CHAPTER_TITLE_CHARS], index, 0, *location])
+        if self.chapters:
+            self.chapters[-1][2] += paragraph.count(' ') + 1
+
+def process_novel(filepath, strategy=DEFAULT_STRATEGY, limit=MAX_PARAGRAPHS):
+    """Process a single novel file with improved paragraph merging
+
+    Keeps the first limit paragraphs (all of them if limit is None); the
+    rest of the file is not read.
+    """
+    novel = novel_info(filepath)
+    
+    paragraphs = []
+    table = ChapterTable()
+    for paragraph, starts_chapter in itertools.islice(novel_paragraphs(filepath, strategy), limit):
+        table.add(paragraph, len(paragraphs), starts_chapter)
+        paragraphs.append(paragraph)
+    
+    novel['content'] = paragraphs
+    novel['chapters'] = table.chapters
+    return novel
+
+def chunk_path(novel_id, chunk, chunk_dir=CHUNK_DIR):
+    return os.path.join(chunk_dir, novel_id, f'{chunk:03d}.json')
+
+def write_novel_chunks(novel, paragraphs, chunk_dir=CHUNK_DIR):
+    """Stream (paragraph, starts_chapter) pairs into a novel's chunk files; returns its index entry
+
+    Chunks start at chapter headers, within the size bounds. They are written
+    to a scratch directory that replaces the novel's chunks once complete.
+    The chapter table records each chapter's chunk and the byte offset of its
+    first paragraph in that chunk file.
+    """
+    novel_dir = os.path.join(chunk_dir, novel['id'])
+    partial_dir = novel_dir + '.partial'
+    shutil.rmtree(partial_dir, ignore_errors=True)
+    os.makedirs(partial_dir)
+    
+    starts = []
+    chunk = []          # The chunk's paragraphs, JSON-encoded
+    chunk_bytes = 0     # Offset of the next paragraph in the chunk file
+    table = ChapterTable()
+    count = 0
+    
+    def write_chunk():
+        path = chunk_path(novel['id'] + '.partial', len(starts) - 1, chunk_dir)
+        with open(path, 'wb') as f:
+            f.write(b'[' + b','.join(chunk) + b']')
+    
+    try:
+        for paragraph, starts_chapter in paragraphs:
+            if chunk and ((starts_chapter and len(chunk) >= CHUNK_MIN_PARAGRAPHS) or len(chunk) >= CHUNK_MAX_PARAGRAPHS):
+                write_chunk()
+                chunk = []
+            if not chunk:
+                starts.append(count)
+                chunk_bytes = 1  # After the opening bracket
+            encoded = json.dumps(paragraph, ensure_ascii=False).encode('utf-8')
+            table.add(paragraph, count, starts_chapter, len(starts) - 1, chunk_bytes)
+            chunk.append(encoded)
+            chunk_bytes += len(encoded) + 1
+            count += 1
+        if chunk:
+            write_chunk()
+    except BaseException:
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        raise
+    
+    # Chunk boundaries move when a book is re-imported, so old chunks go entirely
+    shutil.rmtree(novel_dir, ignore_errors=True)
+    os.rename(partial_dir, novel_dir)
+    
+    return {
+        'title': novel['title'],
+        'author': novel['author'],
+        'chineseName': novel['chinese_name'],
+        'paragraphs': count,
+        'chunks': starts,
+        'chapters': table.chapters
+    }
+
+def import_job(filepath, strategy=DEFAULT_STRATEGY, chunked=False):
+    """Pool worker: import one novel and report (novel, index entry, error message) instead of printing
+
+    In chunked mode the paragraphs go straight to chunk files and only the
+    index entry comes back; otherwise the novel carries its content.
+    """
+    try:
+        if chunked:
+            novel = novel_info(filepath)
+            return novel, write_novel_chunks(novel, novel_paragraphs(filepath, strategy)), None
+        return process_novel(filepath, strategy), None, None
+    except Exception as e:
+        return None, None, f"Error processing {os.path.basename(filepath)}: {e}"
+
+def run_jobs(filepaths, jobs, strategy=DEFAULT_STRATEGY, chunked=False):
+    """Yield (filepath, novel, index entry, error) in input order, using a process pool when jobs > 1"""
+    if jobs <= 1:
+        for filepath in filepaths:
+            yield (filepath,) + import_job(filepath, strategy, chunked)
+        return
+    
+    # Largest books first, so the longest job is not left to start last
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {filepath: executor.submit(import_job, filepath, strategy, chunked)
+                   for filepath in sorted(filepaths, key=os.path.getsize, reverse=True)}
+        for filepath in filepaths:
+            try:
+                yield (filepath,) + futures[filepath].result()
+            except Exception as e:  # The worker process itself died
+                yield filepath, None, None, f"Error processing {os.path.basename(filepath)}: {e}"
+
+def generate_index_javascript(index, strategy=DEFAULT_STRATEGY, chunk_dir=CHUNK_DIR):
+    """Generate the JavaScript index of chunked novels"""
+    entries = ''.join(f'    {json.dumps(novel_id)}: {json.dumps(entry, ensure_ascii=False)},\n'
+                      for novel_id, entry in index.items())
+    return f"""// Novel Index - Auto-generated from txt files
+// DO NOT EDIT MANUALLY - regenerate using {STRATEGIES[strategy]['script']} --chunked
+// Paragraphs are in {chunk_dir}/<novel id>/<chunk>.json; chunk i starts at paragraph chunks[i]
+// chapters: [title, first paragraph, words, chunk, byte offset in the chunk file]
+
+const NOVELS_CHUNK_DIR = '{chunk_dir}';
+const NOVELS_INDEX = {{
+{entries}}};
+
+// Export for use in novels.js
+if (typeof module !== 'undefined' && module.exports) {{
+    module.exports = NOVELS_INDEX;
+}}
+"""
+
+def generate_javascript(novels, strategy=DEFAULT_STRATEGY):
+    """Generate JavaScript file with novel data"""
+    info = STRATEGIES[strategy]
+    
+    js_content = f"""// Novel Data - Auto-generated from txt files
+// DO NOT EDIT MANUALLY - regenerate using {info['script']}
+"""
+    if info['note']:
+        js_content += f"// {info['note']}\n"
+    js_content += """// chapters: [title, first paragraph, words]
+
+const NOVELS_DATA = {
+"""
+    
+    for novel in novels:
+        # Escape special characters in content
+        content_json = json.dumps(novel['content'], ensure_ascii=False, indent=8)
+        
+        js_content += f"""    "{novel['id']}": {{
+        "title": "{novel['title']}",
+        "author": "{novel['author']}",
+        "chineseName": "{novel['chinese_name']}",
+        "chapters": {json.dumps(novel['chapters'], ensure_ascii=False)},
+        "content": {content_json}
+    }},
+"""
+    
+    js_content += """};
+
+// Export for use in novels.js
+if (typeof module !== 'undefined' && module.exports) {
+    module.exports = NOVELS_DATA;
+}
+"""
+    
+    return js_content
+
+def main(strategy=DEFAULT_STRATEGY):
+    """Main function; strategy is the default for --strategy"""
+    parser = argparse.ArgumentParser(description='Import novels from txt files for the novel reader')
+    parser.add_argument('--strategy', choices=STRATEGIES, default=strategy,
+                        help=f'how lines become paragraphs (default: {strategy})')
+    parser.add_argument('--chunked', action='store_true',
+                        help=f'write complete novels as JSON chunks in {CHUNK_DIR}/ with an index in {OUTPUT_FILE}')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help=f'worker processes (default: 1, this machine has {os.cpu_count()} cores)')
+    args = parser.parse_args()
+    info = STRATEGIES[args.strategy]
+
+    print(info['intro'])
+    print(f"📁 Source directory: {NOVELS_DIR}")
+    
+    # Check if directory exists
+    if not os.path.exists(NOVELS_DIR):
+        print(f"❌ Error: Directory not found: {NOVELS_DIR}")
+        return
+    
+    # Process all txt files
+    novels = []
+    txt_files = [f for f in os.listdir(NOVELS_DIR) if f.endswith('.txt')]
+    
+    if not txt_files:
+        print(f"❌ No .txt files found in {NOVELS_DIR}")
+        return
+    
+    print(f"\n📖 Found {len(txt_files)} novel files")
+    
+    if args.jobs > 1:
+        print(f"Using {args.jobs} worker processes")
+    
+    index = {}
+    filepaths = [os.path.join(NOVELS_DIR, filename) for filename in sorted(txt_files)]
+    for filepath, novel, entry, error in run_jobs(filepaths, args.jobs, args.strategy, args.chunked):
+        print(f"\n📚 Processing: {os.path.splitext(os.path.basename(filepath))[0]}")
+        if error:
+            print(f"   ❌ {error}")
+            continue
+        if args.chunked:
+            print(f"   ✓ {info['processed'].format(count=entry['paragraphs'])} in {len(entry['chunks'])} chunks")
+            index[novel['id']] = entry
+        else:
+            print(f"   ✓ {info['processed'].format(count=len(novel['content']))}")
+        novels.append(novel)
+    
+    # Generate JavaScript file
+    print(f"\n💾 Generating {OUTPUT_FILE}...")
+    if args.chunked:
+        js_content = generate_index_javascript(index, args.strategy)
+    else:
+        js_content = generate_javascript(novels, args.strategy)
+    
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        f.write(js_content)
+    
+    print(f"✅ Successfully created {OUTPUT_FILE}")
+    print(f"📊 Imported {len(novels)} novels:")
+    for novel in novels:
+        paragraph_count = index[novel['id']]['paragraphs'] if args.chunked else len(novel['content'])
+        print(f"   - {novel['title']} ({novel['chinese_name']}): {paragraph_count} paragraphs")
+    if args.chunked:
+        chunks = sum(len(entry['chunks']) for entry in index.values())
+        print(f"📦 {chunks} chunks written to {CHUNK_DIR}/")
+    
+    print(f"\n{info['outro']}")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -7,6 +7,9 @@ let currentPage = 1;
 let paragraphsPerPage = 10;
 let totalPages = 1;
 let allParagraphs = [];
+let chunkStarts = null;        // First paragraph of each chunk, for chunked novels
+let chunkRequests = new Map(); // Chunk -> fetch promise, for the current novel
+let chapters = [];             // [title, first paragraph, words, chunk, byte offset], in book order
 let selectedParagraph = null;
 
 // Translation API (using free MyMemory API)
@@ -14,7 +17,7 @@ const TRANSLATION_API = 'https://api.mymemory.translated.net/get';
 
 // DOM elements
 let novelContent, novelTitle, novelAuthor, translationTooltip;
-let prevBtn, nextBtn, pageInput, totalPagesSpan;
+let prevBtn, nextBtn, pageInput, totalPagesSpan, chapterSelect;
 
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
@@ -27,6 +30,7 @@ document.addEventListener('DOMContentLoaded', function() {
     nextBtn = document.getElementById('nextBtn');
     pageInput = document.getElementById('pageInput');
     totalPagesSpan = document.getElementById('totalPages');
+    chapterSelect = document.getElementById('chapterSelect');
     
     // Load default novel
     loadNovel(currentNovelId);
@@ -64,8 +68,9 @@ function loadNovel(novelId) {
     currentNovelId = novelId;
     currentPage = 1;
     
-    // Get novel data from NOVELS_DATA (loaded from novels_data.js)
-    const novel = NOVELS_DATA[novelId];
+    // Chunked novels (import_novels_v3.py --chunked) only list their chunks in
+    // NOVELS_INDEX; otherwise all paragraphs are inlined in NOVELS_DATA
+    const novel = typeof NOVELS_DATA !== 'undefined' ? NOVELS_DATA[novelId] : NOVELS_INDEX[novelId];
     
     if (!novel) {
         console.error('Novel not found:', novelId);
@@ -76,8 +81,12 @@ function loadNovel(novelId) {
     novelTitle.textContent = novel.title;
     novelAuthor.textContent = 'By ' + novel.author;
     
-    // Store all paragraphs
-    allParagraphs = novel.content;
+    // Store all paragraphs (chunked novels fill this in as chunks are fetched)
+    allParagraphs = novel.content || new Array(novel.paragraphs);
+    chunkStarts = novel.chunks || null;
+    chunkRequests = new Map();
+    chapters = novel.chapters || [];
+    updateChapterSelect();
     
     // Calculate total pages
     totalPages = Math.ceil(allParagraphs.length / paragraphsPerPage);
@@ -89,18 +98,124 @@ function loadNovel(novelId) {
     displayPage(1);
 }
 
+// Fill the chapter list of the current novel
+function updateChapterSelect() {
+    if (!chapterSelect) return;
+    chapterSelect.innerHTML = '';
+    const contents = document.createElement('option');
+    contents.value = -1;
+    contents.textContent = '目录';
+    chapterSelect.appendChild(contents);
+    chapters.forEach(([title, start, words], i) => {
+        const option = document.createElement('option');
+        option.value = i;
+        option.textContent = title;
+        option.title = `${words} words`;
+        chapterSelect.appendChild(option);
+    });
+    chapterSelect.style.display = chapters.length ? '' : 'none';
+}
+
+// Index of the chapter holding paragraph index, or -1 before the first chapter
+function chapterOf(index) {
+    let low = -1, high = chapters.length - 1;
+    while (low < high) {
+        const mid = (low + high + 1) >> 1;
+        if (chapters[mid][1] <= index) low = mid;
+        else high = mid - 1;
+    }
+    return low;
+}
+
+// Jump to the page where a chapter starts
+function goToChapter(chapter) {
+    chapter = parseInt(chapter);
+    if (chapter >= 0 && chapter < chapters.length) {
+        displayPage(Math.floor(chapters[chapter][1] / paragraphsPerPage) + 1);
+    }
+}
+
+// Fetch the chunk where the next chapter starts, so turning to it does not wait
+function prefetchNextChapter(chapter) {
+    if (!chunkStarts || chapter + 1 >= chapters.length) return;
+    loadChunk(chapters[chapter + 1][3]).catch(() => {});  // Retried when actually needed
+}
+
+// Index of the chunk holding paragraph index (binary search over chunk starts)
+function chunkOf(index) {
+    let low = 0, high = chunkStarts.length - 1;
+    while (low < high) {
+        const mid = (low + high + 1) >> 1;
+        if (chunkStarts[mid] <= index) low = mid;
+        else high = mid - 1;
+    }
+    return low;
+}
+
+// Fetch a chunk of the current novel into allParagraphs (once)
+function loadChunk(chunk) {
+    if (!chunkRequests.has(chunk)) {
+        // The reader may switch novels before the chunk arrives
+        const novelId = currentNovelId;
+        const paragraphs = allParagraphs;
+        const requests = chunkRequests;
+        const start = chunkStarts[chunk];
+        const url = `${NOVELS_CHUNK_DIR}/${novelId}/${String(chunk).padStart(3, '0')}.json`;
+        const request = fetch(url)
+            .then(response => {
+                if (!response.ok) throw new Error(`${url}: ${response.status}`);
+                return response.json();
+            })
+            .then(content => {
+                content.forEach((text, i) => { paragraphs[start + i] = text; });
+            })
+            .catch(error => {
+                requests.delete(chunk);  // Allow a retry on the next visit
+                throw error;
+            });
+        chunkRequests.set(chunk, request);
+    }
+    return chunkRequests.get(chunk);
+}
+
+// Make sure paragraphs [startIdx, endIdx) are loaded
+function loadParagraphs(startIdx, endIdx) {
+    if (!chunkStarts || startIdx >= endIdx) {
+        return Promise.resolve();
+    }
+    const requests = [];
+    for (let chunk = chunkOf(startIdx); chunk <= chunkOf(endIdx - 1); chunk++) {
+        requests.push(loadChunk(chunk));
+    }
+    return Promise.all(requests);
+}
+
 // Display specific page
-function displayPage(page) {
+async function displayPage(page) {
     if (page < 1 || page > totalPages) {
         return;
     }
     
     currentPage = page;
+    const novelId = currentNovelId;
     
     // Calculate paragraph range for this page
     const startIdx = (page - 1) * paragraphsPerPage;
     const endIdx = Math.min(startIdx + paragraphsPerPage, allParagraphs.length);
     
+    try {
+        await loadParagraphs(startIdx, endIdx);
+    } catch (error) {
+        console.error('Failed to load novel content:', error);
+        novelContent.textContent = '内容加载失败,请稍后重试';
+        return;
+    }
+    
+    // Another page or novel was requested while this one was loading
+    if (page !== currentPage || novelId !== currentNovelId) {
+        return;
+    }
+    
     // Clear current content
     novelContent.innerHTML = '';
     
@@ -125,6 +240,11 @@ function displayPage(page) {
     // Update pagination controls
     updatePagination();
     
+    // Show the chapter the page ends in and get the next one ready
+    const chapter = chapterOf(endIdx - 1);
+    if (chapterSelect) chapterSelect.value = chapter;
+    prefetchNextChapter(chapter);
+    
     // Scroll to top of content
     novelContent.scrollIntoView({ behavior: 'smooth', block: 'start' });
 }
@@ -6,14 +6,14 @@ Process all article HTML files to:
 3. Clean ads and irrelevant content
 4. Unify font styles
 """
+import argparse
 import os
 import re
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from soup_parser import make_soup
+from build_manifest import BuildManifest
 
 articles_dir = 'articles'
-article_files = [f for f in os.listdir(articles_dir) if f.endswith('.html')]
-
-print(f"Processing {len(article_files)} article files...")
 
 # Patterns to identify ad/promotional content
 AD_PATTERNS = [
@@ -61,16 +61,26 @@ def clean_paragraph(p_tag):
     
     return p_tag.get_text().strip()
 
-def process_article(filepath):
-    """Process single article file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f.read(), 'html.parser')
+def is_bilingual(html):
+    """Whether an article already has the bilingual structure"""
+    return 'paragraph-block' in html
+
+def build_bilingual_html(html):
+    """Rebuild an article page with the bilingual structure, or None if it has no article-content div
+
+    Articles that are already bilingual are returned unchanged: converting
+    them again would read each Chinese line as another English paragraph and
+    replace the translations with placeholders.
+    """
+    if is_bilingual(html):
+        return html
+    
+    soup = make_soup(html)
     
     # Find the article content div
     article_content = soup.find('div', class_='article-content')
     if not article_content:
-        print(f"  ✗ No article-content div found in {os.path.basename(filepath)}")
-        return False
+        return None
     
     # Extract title
     title_tag = article_content.find('h1')
@@ -253,34 +263,107 @@ def process_article(filepath):
 </body>
 </html>'''
     
-    # Write back to file
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(new_content_html)
+    return new_content_html
+
+def process_article(filepath):
+    """Process single article file; True if it is bilingual afterwards"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    new_content_html = build_bilingual_html(content)
+    
+    if new_content_html is None:
+        return False
+    
+    # Write back to file (already bilingual articles are left alone)
+    if new_content_html != content:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(new_content_html)
     
     return True
 
-# Process all articles
-processed = 0
-errors = 0
-
-for filename in article_files:
-    filepath = os.path.join(articles_dir, filename)
+def process_job(filepath):
+    """Pool worker: process one article and report (ok, error message) instead of printing"""
     try:
         if process_article(filepath):
+            return True, None
+        return False, f"No article-content div found in {os.path.basename(filepath)}"
+    except Exception as e:
+        return False, f"Error processing {os.path.basename(filepath)}: {e}"
+
+def run_jobs(filepaths, jobs):
+    """Yield (filepath, ok, error) in input order, using a process pool when jobs > 1"""
+    if jobs <= 1:
+        for filepath in filepaths:
+            yield (filepath,) + process_job(filepath)
+        return
+    
+    # A few chunks per worker keeps IPC overhead low while balancing uneven file sizes
+    chunksize = max(1, len(filepaths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for filepath, result in zip(filepaths, executor.map(process_job, filepaths, chunksize=chunksize)):
+            yield (filepath,) + result
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert articles to the bilingual layout')
+    parser.add_argument('--full', action='store_true', help='ignore the build manifest and reprocess every article')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help=f'worker processes (default: 1, this machine has {os.cpu_count()} cores)')
+    args = parser.parse_args()
+    
+    article_files = [f for f in os.listdir(articles_dir) if f.endswith('.html')]
+    manifest = BuildManifest()
+    
+    print(f"Processing {len(article_files)} article files...")
+    
+    # Process all articles
+    processed = 0
+    skipped = 0
+    errors = 0
+    
+    # Unchanged since we last wrote them - nothing to do
+    todo = []
+    for filename in article_files:
+        filepath = os.path.join(articles_dir, filename)
+        try:
+            if not args.full and manifest.get_outputs(filename, filepath, 'bilingual'):
+                skipped += 1
+                continue
+        except Exception as e:
+            errors += 1
+            print(f"  ✗ Error processing {filename}: {e}")
+            continue
+        todo.append(filepath)
+    
+    if args.jobs > 1:
+        print(f"Using {args.jobs} worker processes for {len(todo)} articles")
+    
+    for i, (filepath, ok, error) in enumerate(run_jobs(todo, args.jobs), 1):
+        filename = os.path.basename(filepath)
+        if ok:
+            try:
+                manifest.set_outputs(filename, filepath, 'bilingual')
+            except Exception as e:
+                ok, error = False, f"Error processing {filename}: {e}"
+        if ok:
             processed += 1
-            print(f"  ✓ {filename}")
+            print(f"  [{i}/{len(todo)}] ✓ {filename}")
         else:
             errors += 1
-    except Exception as e:
-        errors += 1
-        print(f"  ✗ Error processing {filename}: {e}")
+            print(f"  [{i}/{len(todo)}] ✗ {error}")
+    
+    manifest.prune(article_files)
+    manifest.save()
+    
+    print(f"\n{'='*60}")
+    print(f"Processing complete!")
+    print(f"  Successfully processed: {processed} files")
+    print(f"  Unchanged (skipped): {skipped} files")
+    print(f"  Errors: {errors} files")
+    print(f"\nArticles now have:")
+    print(f"  ✓ Bilingual structure (English + [翻译占位])")
+    print(f"  ✓ Hyperlinks removed")
+    print(f"  ✓ Ads and promotional content cleaned")
+    print(f"  ✓ Unified font styles (Georgia for English, Microsoft YaHei for Chinese)")
 
-print(f"\n{'='*60}")
-print(f"Processing complete!")
-print(f"  Successfully processed: {processed} files")
-print(f"  Errors: {errors} files")
-print(f"\nArticles now have:")
-print(f"  ✓ Bilingual structure (English + [翻译占位])")
-print(f"  ✓ Hyperlinks removed")
-print(f"  ✓ Ads and promotional content cleaned")
-print(f"  ✓ Unified font styles (Georgia for English, Microsoft YaHei for Chinese)")
+if __name__ == '__main__':
+    main()
@@ -3,74 +3,91 @@
 Rebuild webnovels.html from all articles in the articles/ folder.
 No deduplication - uses ALL .html files found.
 """
+import argparse
 import os
 import re
-from bs4 import BeautifulSoup
+import sys
+from soup_parser import make_soup
+from build_manifest import BuildManifest
+from webnovels_index import write_index_and_shell
 
-# Get all HTML files in articles folder
 articles_dir = 'articles'
-article_files = sorted([f for f in os.listdir(articles_dir) if f.endswith('.html')])
 
-print(f"Found {len(article_files)} HTML files in {articles_dir}/")
-
-# Extract title and generate article entries
-articles_data = []
-for filename in article_files:
-    filepath = os.path.join(articles_dir, filename)
-    
-    try:
-        # Read the HTML file and extract the title
-        with open(filepath, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
-            
-        # Try to get title from <title> tag
-        title_tag = soup.find('title')
-        if title_tag:
-            title = title_tag.get_text(strip=True)
-            # Remove common suffixes from title
-            title = re.sub(r'\s*-\s*English Novel Reader.*$', '', title)
-            title = re.sub(r'\s*\|\s*.*$', '', title)
-        else:
-            # Fallback: generate title from filename
-            title = filename.replace('.html', '').replace('_', ' ').replace('-', ' ').title()
-        
-        # Default tags (all articles get 'ai' tag)
-        tags = 'ai'
-        
-        articles_data.append({
-            'filename': filename,
-            'title': title,
-            'tags': tags
-        })
+def extract_title(filepath, filename):
+    """Title of one article, from its <title> tag or its filename"""
+    # Read the HTML file and extract the title
+    with open(filepath, 'r', encoding='utf-8') as f:
+        soup = make_soup(f.read())
         
-    except Exception as e:
-        print(f"  Error processing {filename}: {e}")
-        # Use filename as title if extraction fails
-        title = filename.replace('.html', '').replace('_', ' ').title()
-        articles_data.append({
-            'filename': filename,
-            'title': title,
-            'tags': 'ai'
-        })
+    # Try to get title from <title> tag
+    title_tag = soup.find('title')
+    if title_tag:
+        title = title_tag.get_text(strip=True)
+        # Remove common suffixes from title
+        title = re.sub(r'\s*-\s*English Novel Reader.*$', '', title)
+        title = re.sub(r'\s*\|\s*.*$', '', title)
+    else:
+        # Fallback: generate title from filename
+        title = filename.replace('.html', '').replace('_', ' ').replace('-', ' ').title()
+    return title
 
-print(f"Successfully processed {len(articles_data)} articles")
+def collect_articles_data(article_files, manifest, force=False):
+    """Title every article, reusing manifest results for unchanged files"""
+    articles_data = []
+    reused = 0
+    for filename in article_files:
+        filepath = os.path.join(articles_dir, filename)
+        
+        try:
+            outputs = None if force else manifest.get_outputs(filename, filepath, 'index_title')
+            if outputs:
+                title = outputs['title']
+                reused += 1
+            else:
+                title = extract_title(filepath, filename)
+                manifest.set_outputs(filename, filepath, 'index_title', title=title)
+            
+            # Default tags (all articles get 'ai' tag)
+            tags = 'ai'
+            
+            articles_data.append({
+                'filename': filename,
+                'title': title,
+                'tags': tags
+            })
+            
+        except Exception as e:
+            print(f"  Error processing {filename}: {e}")
+            # Use filename as title if extraction fails
+            title = filename.replace('.html', '').replace('_', ' ').title()
+            articles_data.append({
+                'filename': filename,
+                'title': title,
+                'tags': 'ai'
+            })
+    
+    if reused:
+        print(f"  Reused titles for {reused} unchanged articles")
+    return articles_data
 
-# Read the webnovels.html header (up to articles section)
-with open('webnovels.html', 'r', encoding='utf-8') as f:
-    content = f.read()
-    header_end = content.find('<div class="webnovel-content" id="webnovelContent">')
-    if header_end == -1:
-        print("Error: Could not find article content section in webnovels.html")
-        exit(1)
-    header = content[:header_end + len('<div class="webnovel-content" id="webnovelContent">')]
+def write_rebuilt_page(articles_data):
+    """Write webnovels_rebuilt.html from the article titles"""
+    # Read the webnovels.html header (up to articles section)
+    with open('webnovels.html', 'r', encoding='utf-8') as f:
+        content = f.read()
+        header_end = content.find('<div class="webnovel-content" id="webnovelContent">')
+        if header_end == -1:
+            print("Error: Could not find article content section in webnovels.html")
+            sys.exit(1)
+        header = content[:header_end + len('<div class="webnovel-content" id="webnovelContent">')]
 
-# Generate article HTML entries
-articles_html = []
-for data in articles_data:
-    tags_list = data['tags'].split()
-    tags_html = ' '.join([f'<span class="article-tag">{tag}</span>' for tag in tags_list])
+    # Generate article HTML entries
+    articles_html = []
+    for data in articles_data:
+        tags_list = data['tags'].split()
+        tags_html = ' '.join([f'<span class="article-tag">{tag}</span>' for tag in tags_list])
     
-    article_html = f'''                    <div class="webnovel-article" data-tags="{data['tags']}">
+        article_html = f'''                    <div class="webnovel-article" data-tags="{data['tags']}">
                         <h2 class="webnovel-title">
                             <a href="articles/{data['filename']}" class="webnovel-title-link">
                                 {data['title']}
@@ -80,10 +97,10 @@ for data in articles_data:
                             {tags_html}
                         </div>
                     </div>'''
-    articles_html.append(article_html)
+        articles_html.append(article_html)
 
-# Generate footer with JavaScript
-footer = '''
+    # Generate footer with JavaScript
+    footer = '''
                 </div>
             </main>
         </div>
@@ -127,13 +144,42 @@ footer = '''
 </body>
 </html>'''
 
-# Write the new webnovels.html
-new_html = header + '\n' + '\n'.join(articles_html) + footer
+    # Write the new webnovels.html
+    new_html = header + '\n' + '\n'.join(articles_html) + footer
+
+    with open('webnovels_rebuilt.html', 'w', encoding='utf-8') as f:
+        f.write(new_html)
 
-with open('webnovels_rebuilt.html', 'w', encoding='utf-8') as f:
-    f.write(new_html)
+    print(f"\n✓ Generated webnovels_rebuilt.html with {len(articles_data)} articles")
+    print(f"  Review the file, then run:")
+    print(f"    mv webnovels.html webnovels_backup.html")
+    print(f"    mv webnovels_rebuilt.html webnovels.html")
+
+def main():
+    parser = argparse.ArgumentParser(description='Rebuild webnovels.html from all articles in articles/')
+    parser.add_argument('--full', action='store_true', help='ignore the build manifest and re-read every article')
+    parser.add_argument('--json', action='store_true',
+                        help='write the article list to webnovels_index.json and a shell page that renders it')
+    parser.add_argument('--compress', action='store_true', help='with --json, also write precompressed .gz/.br copies')
+    args = parser.parse_args()
+    
+    # Get all HTML files in articles folder
+    article_files = sorted([f for f in os.listdir(articles_dir) if f.endswith('.html')])
+    
+    print(f"Found {len(article_files)} HTML files in {articles_dir}/")
+    
+    # Extract title and generate article entries
+    manifest = BuildManifest()
+    articles_data = collect_articles_data(article_files, manifest, force=args.full)
+    manifest.prune(article_files)
+    manifest.save()
+    
+    print(f"Successfully processed {len(articles_data)} articles")
+    
+    if args.json:
+        write_index_and_shell(articles_data, 'webnovels_rebuilt.html', compress=args.compress)
+    else:
+        write_rebuilt_page(articles_data)
 
-print(f"\n✓ Generated webnovels_rebuilt.html with {len(articles_data)} articles")
-print(f"  Review the file, then run:")
-print(f"    mv webnovels.html webnovels_backup.html")
-print(f"    mv webnovels_rebuilt.html webnovels.html")
+if __name__ == '__main__':
+    main()
@@ -17,6 +17,14 @@ PLACEHOLDER_PATTERNS = [
     r'<div class="image-container[^>]*>.*?</div>'
 ]
 
+def strip_placeholders(content):
+    """Remove placeholder and image markup from one article, returning (content, removed_count)"""
+    removed = 0
+    for pattern in PLACEHOLDER_PATTERNS:
+        content, count = re.subn(pattern, '', content, flags=re.DOTALL)
+        removed += count
+    return content, removed
+
 def remove_placeholders():
     """Remove translation placeholders from all HTML files in the articles directory."""
     # Get all HTML files in the articles directory
@@ -40,10 +48,8 @@ def remove_placeholders():
             original_content = content
             
             # Remove all placeholder patterns
-            for pattern in PLACEHOLDER_PATTERNS:
-                matches = re.findall(pattern, content, re.DOTALL)
-                removed_placeholders += len(matches)
-                content = re.sub(pattern, '', content, flags=re.DOTALL)
+            content, removed = strip_placeholders(content)
+            removed_placeholders += removed
             
             # If content has changed, write it back to the file
             if content != original_content:
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Shared HTML parsing facade for the article scripts
+
+make_soup() builds a BeautifulSoup tree with the fastest tree builder that is
+installed: lxml when available, otherwise the stdlib html.parser. Set the
+SOUP_PARSER environment variable (e.g. SOUP_PARSER=html.parser) to force one.
+"""
+import os
+from bs4 import BeautifulSoup, FeatureNotFound
+
+# Tree builders in order of preference (fastest first)
+PREFERRED_PARSERS = ['lxml', 'html.parser']
+
+def available_parsers():
+    """BeautifulSoup tree builders usable in this environment"""
+    names = []
+    for name in PREFERRED_PARSERS + ['html5lib']:
+        try:
+            BeautifulSoup('', name)
+            names.append(name)
+        except FeatureNotFound:
+            continue
+    return names
+
+def _select_parser():
+    forced = os.environ.get('SOUP_PARSER')
+    if forced:
+        if forced in available_parsers():
+            return forced
+        print(f"Warning: SOUP_PARSER={forced} is not installed, falling back")
+    for name in PREFERRED_PARSERS:
+        if name in available_parsers():
+            return name
+    return 'html.parser'
+
+PARSER = _select_parser()
+
+def make_soup(markup, parser=None):
+    """Parse markup with the selected backend"""
+    return BeautifulSoup(markup, parser or PARSER)
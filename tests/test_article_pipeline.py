@@ -0,0 +1,28 @@
+from article_pipeline import DEFAULT_STAGES, run_pipeline, select_stages
+
+RAW_ARTICLE = '''<html><body>
+<div class="article-content">
+    <h1>A Test Article</h1>
+    <p>The first paragraph is long enough to be kept as article content.</p>
+</div>
+</body></html>'''
+
+PLACEHOLDER = '<p class="chinese-text">[翻译占位 - Translation placeholder]</p>'
+
+def names(stages):
+    return [name for name, _ in stages]
+
+def test_placeholders_not_run_by_default():
+    assert 'placeholders' not in DEFAULT_STAGES
+    assert names(select_stages(DEFAULT_STAGES, has_translator=True)) == DEFAULT_STAGES
+
+def test_placeholders_dropped_with_translate():
+    stages = select_stages(['bilingual', 'translate', 'placeholders', 'news_nav'], has_translator=False)
+    assert names(stages) == ['bilingual', 'news_nav']
+
+def test_new_articles_keep_their_translation_slots(tmp_path):
+    path = tmp_path / 'article.html'
+    path.write_text(RAW_ARTICLE, encoding='utf-8')
+    _, written, errors = run_pipeline([str(path)], select_stages(DEFAULT_STAGES, has_translator=False))
+    assert (written, errors) == (1, 0)
+    assert path.read_text(encoding='utf-8').count(PLACEHOLDER) == 1
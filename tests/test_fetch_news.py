@@ -0,0 +1,92 @@
+import pytest
+
+import fetch_news
+from fetch_cache import FetchCache
+from fetch_news import StreamingArticleParser, ValidatorStore, parse_article_html, parse_article_streaming
+
+def page(body):
+    return f'<html><head><title>Test page</title></head><body>{body}</body></html>'
+
+LOWER_PRIORITY_FIRST = page('''
+<div class="content"><p>A teaser paragraph in a generic content box.</p></div>
+<nav><article><p>An article paragraph inside the navigation.</p></article></nav>
+<article><p>The first paragraph of the actual article.</p><p>The second paragraph of the actual article.</p></article>
+<article><p>A paragraph from a related article further down.</p></article>
+<main><p>A paragraph in the main wrapper after the article.</p></main>
+''')
+
+@pytest.mark.parametrize('parse', [parse_article_streaming, parse_article_html])
+def test_selector_priority_over_document_order(parse):
+    record = parse(LOWER_PRIORITY_FIRST, 'https://example.com/news/story')
+    assert record['content'] == ('The first paragraph of the actual article. '
+                                 'The second paragraph of the actual article.')
+
+def test_streaming_matches_dom():
+    html = page('<div id="content"><p>Only matched by the last selector here.</p></div>'
+                '<div class="entry-content"><p>Matched by a higher-priority selector.</p></div>')
+    url = 'https://example.com/news/story'
+    assert parse_article_streaming(html, url) == parse_article_html(html, url)
+
+def test_no_content_element_falls_back_to_first_paragraphs():
+    record = parse_article_streaming(page('<div><p>A paragraph outside any content element.</p></div>'),
+                                     'https://example.com/news/story')
+    assert record['content'] == 'A paragraph outside any content element.'
+
+def test_stops_once_the_top_selector_is_full():
+    paragraphs = ''.join(f'<p>Paragraph number {i} of the article body.</p>' for i in range(50))
+    parser = StreamingArticleParser(max_paragraphs=5)
+    parser.feed(page(f'<article>{paragraphs}</article>'))
+    assert parser.done
+    assert len(parser.paragraphs()) == 5
+
+URL = 'https://example.com/news/story'
+
+class FakeResponse:
+    status_code = 304
+    headers = {}
+
+class FakeSession:
+    def __init__(self):
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, headers))
+        return FakeResponse()
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = FakeSession()
+    monkeypatch.setattr(fetch_news, 'get_session', lambda workers=None: fake)
+    return fake
+
+def cached_record(tmp_path, ttl):
+    cache = FetchCache(str(tmp_path / 'cache'), ttl=ttl)
+    item = {'title': 'Cached', 'content': 'Cached text', 'url': URL, 'date': '2025-01-01'}
+    cache.put(URL, b'<html></html>', item)
+    return cache, item
+
+
+def test_fresh_cache_hit_makes_no_request(tmp_path, session):
+    cache, item = cached_record(tmp_path, ttl=3600)
+    assert fetch_news.fetch_all([URL], max_workers=1, delay=0, cache=cache) == [item]
+    assert session.requests == []
+
+def test_stale_entry_is_revalidated(tmp_path, session):
+    cache, item = cached_record(tmp_path, ttl=-1)
+    validators = ValidatorStore(str(tmp_path / 'validators.json'))
+    validators.entries[URL] = {'etag': '"v1"'}
+    assert fetch_news.extract_article_content(URL, validators, cache) == item
+    assert session.requests == [(URL, {'If-None-Match': '"v1"'})]
+
+def test_refresh_revalidates_fresh_entries(tmp_path, session):
+    cache, item = cached_record(tmp_path, ttl=3600)
+    assert fetch_news.extract_article_content(URL, cache=cache, refresh=True) == item
+    assert len(session.requests) == 1
+
+def test_connection_pool_fits_the_workers(monkeypatch):
+    monkeypatch.setattr(fetch_news, '_session', None)
+    monkeypatch.setattr(fetch_news, '_session_pool_size', 0)
+    session = fetch_news.get_session(20)
+    assert session.get_adapter('https://example.com')._pool_maxsize == 20
+    assert fetch_news.get_session() is session
+    assert session.get_adapter('https://example.com')._pool_maxsize == 20
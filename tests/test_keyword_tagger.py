@@ -0,0 +1,28 @@
+from add_tags_and_pagination import TAGGER
+from keyword_tagger import KeywordTagger
+
+def tags(text):
+    return set(TAGGER.count_tags(text))
+
+def test_short_stems_do_not_match_longer_words():
+    assert 'Regulation' not in tags('They mowed the lawn.')
+    assert 'Employment' not in tags('A new workflow for the team workshop.')
+    assert 'Employment' not in tags('Pages synced with Google Workspace after a workout.')
+
+def test_short_stems_match_listed_inflections():
+    assert 'Regulation' in tags('New laws and a lawsuit against the company.')
+    assert 'Employment' in tags('Workers lost their jobs.')
+    assert 'Employment' in tags('She worked in the workplace.')
+
+def test_long_stems_match_by_prefix():
+    assert 'Robotics' in tags('Advances in robotics.')
+    assert 'Regulation' in tags('EU regulations on AI.')
+
+def test_names_match_whole_words():
+    assert 'Intel' not in tags('Artificial intelligence is everywhere.')
+    assert 'Ford' not in tags('Few can afford it.')
+
+def test_min_stem_chars():
+    tagger = KeywordTagger({}, stems={'law': 'Law', 'legal': 'Legal'})
+    assert set(tagger.count_tags('laws lawn legally')) == {'Law', 'Legal'}
+    assert tagger.count_tags('lawn') == {}
@@ -0,0 +1,82 @@
+import json
+
+import pytest
+
+import novel_import_engine
+from novel_import_engine import STRATEGIES, chunk_path, novel_info, novel_paragraphs, process_novel, write_novel_chunks
+
+CHAPTERS = 6
+LINES_PER_CHAPTER = 40
+
+def write_novel(tmp_path):
+    lines = ['*** START OF THE PROJECT GUTENBERG EBOOK TEST NOVEL ***', '']
+    for chapter in range(1, CHAPTERS + 1):
+        lines += [f'CHAPTER {chapter}', '']
+        lines += [f'Line {line} of chapter {chapter} is a sentence long enough to be kept, café.'
+                  for line in range(1, LINES_PER_CHAPTER + 1)]
+        lines.append('')
+    lines.append('*** END OF THE PROJECT GUTENBERG EBOOK TEST NOVEL ***')
+    path = tmp_path / 'Test Novel.txt'
+    path.write_text('\n'.join(lines), encoding='utf-8')
+    return str(path)
+
+def read_chunks(entry, novel_id, chunk_dir):
+    chunks = []
+    for chunk in range(len(entry['chunks'])):
+        with open(chunk_path(novel_id, chunk, chunk_dir), 'rb') as f:
+            chunks.append(json.loads(f.read()))
+    return chunks
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(novel_import_engine, 'CHUNK_MIN_PARAGRAPHS', 2)
+    monkeypatch.setattr(novel_import_engine, 'CHUNK_MAX_PARAGRAPHS', 25)
+
+# Every line is a paragraph; merged, each chapter is its header plus one
+# paragraph of 560 words, which splitting cuts into three
+@pytest.mark.parametrize('strategy, paragraphs', [
+    ('lines', CHAPTERS * LINES_PER_CHAPTER),
+    ('merge', CHAPTERS * 2),
+    ('merge_split', CHAPTERS * 4),
+])
+def test_strategy_paragraph_counts(tmp_path, strategy, paragraphs):
+    path = write_novel(tmp_path)
+    assert len(list(novel_paragraphs(path, strategy))) == paragraphs
+    assert len(process_novel(path, strategy, limit=None)['content']) == paragraphs
+
+@pytest.mark.parametrize('strategy', STRATEGIES)
+def test_chunks_reassemble_to_the_novel(tmp_path, small_chunks, strategy):
+    path = write_novel(tmp_path)
+    novel = novel_info(path)
+    entry = write_novel_chunks(novel, novel_paragraphs(path, strategy), str(tmp_path / 'chunks'))
+
+    chunks = read_chunks(entry, novel['id'], str(tmp_path / 'chunks'))
+    assert len(chunks) > 1
+    assert entry['chunks'] == [sum(map(len, chunks[:i])) for i in range(len(chunks))]
+    paragraphs = [paragraph for chunk in chunks for paragraph in chunk]
+    assert paragraphs == process_novel(path, strategy, limit=None)['content']
+    assert entry['paragraphs'] == len(paragraphs)
+
+@pytest.mark.parametrize('strategy', ['merge', 'merge_split'])
+def test_chapter_offsets_point_at_chapter_starts(tmp_path, monkeypatch, strategy):
+    # Chunks of several chapters, so most chapters start inside a chunk
+    monkeypatch.setattr(novel_import_engine, 'CHUNK_MIN_PARAGRAPHS', 10)
+    path = write_novel(tmp_path)
+    novel = novel_info(path)
+    chunk_dir = str(tmp_path / 'chunks')
+    entry = write_novel_chunks(novel, novel_paragraphs(path, strategy), chunk_dir)
+
+    paragraphs = process_novel(path, strategy, limit=None)['content']
+    chunks = read_chunks(entry, novel['id'], chunk_dir)
+    assert [chapter[0] for chapter in entry['chapters']] == [f'CHAPTER {n}' for n in range(1, CHAPTERS + 1)]
+    assert [chapter[:3] for chapter in entry['chapters']] == process_novel(path, strategy, limit=None)['chapters']
+    assert len(chunks) > 1
+    assert sum(chapter[4] > 1 for chapter in entry['chapters']) > len(chunks)
+    for title, first, words, chunk, offset in entry['chapters']:
+        assert paragraphs[first] == title
+        assert chunks[chunk][first - entry['chunks'][chunk]] == title
+        with open(chunk_path(novel['id'], chunk, chunk_dir), 'rb') as f:
+            data = f.read()
+        # A byte offset, not a character offset: the text has non-ASCII characters
+        paragraph, _ = json.JSONDecoder().raw_decode(data[offset:].decode('utf-8'))
+        assert paragraph == paragraphs[first]
@@ -0,0 +1,47 @@
+from process_articles_bilingual import build_bilingual_html, process_article
+import process_articles_bilingual
+
+RAW_ARTICLE = '''<html><body>
+<div class="article-content">
+    <h1>A Test Article</h1>
+    <p>The first paragraph has <a href="https://example.com">a link</a> in it.</p>
+    <h2>A Section</h2>
+    <p>The second paragraph is long enough to be kept as article content.</p>
+    <p>Subscribe to our newsletter</p>
+</div>
+</body></html>'''
+
+def test_conversion_is_idempotent():
+    once = build_bilingual_html(RAW_ARTICLE)
+    assert once.count('class="paragraph-block"') == 2
+    assert build_bilingual_html(once) == once
+
+def test_translations_survive_a_second_run(tmp_path):
+    path = tmp_path / 'article.html'
+    translated = build_bilingual_html(RAW_ARTICLE).replace('[翻译占位 - Translation placeholder]', '第一段的翻译', 1)
+    path.write_text(translated, encoding='utf-8')
+
+    assert process_article(str(path))
+    assert process_article(str(path))
+    content = path.read_text(encoding='utf-8')
+    assert content == translated
+    assert content.count('第一段的翻译') == 1
+    assert content.count('[翻译占位') == 1
+
+def test_no_article_content():
+    assert build_bilingual_html('<html><body><p>Nothing here</p></body></html>') is None
+
+def test_unreadable_article_does_not_stop_the_run(tmp_path, monkeypatch, capsys):
+    articles = tmp_path / 'articles'
+    articles.mkdir()
+    (articles / 'good.html').write_text(RAW_ARTICLE, encoding='utf-8')
+    (articles / 'vanished.html').symlink_to(tmp_path / 'missing.html')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('sys.argv', ['process_articles_bilingual.py'])
+
+    process_articles_bilingual.main()
+
+    output = capsys.readouterr().out
+    assert 'Successfully processed: 1 files' in output
+    assert 'Errors: 1 files' in output
+    assert 'paragraph-block' in (articles / 'good.html').read_text(encoding='utf-8')
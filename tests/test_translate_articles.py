@@ -0,0 +1,37 @@
+import threading
+
+import pytest
+
+import translate_articles
+
+class Translated:
+    def __init__(self, text):
+        self.text = text
+
+class FakeTranslator:
+    """Behaves like googletrans 4.0.0rc1: one string in, one Translated out"""
+    calls = []
+
+    def translate(self, text, dest='en', src='auto'):
+        FakeTranslator.calls.append(text)
+        # The pinned library does not batch: a list comes back as a single Translated
+        return Translated(f'[{dest}] {text}')
+
+@pytest.fixture
+def fake_google(monkeypatch):
+    FakeTranslator.calls = []
+    monkeypatch.setattr(translate_articles, 'Translator', FakeTranslator)
+    monkeypatch.setattr(translate_articles, '_thread_translators', threading.local())
+    return FakeTranslator
+
+def test_batch_translates_each_text(fake_google):
+    texts = ['First paragraph.', 'Second paragraph.', 'Third paragraph.']
+    assert translate_articles.google_translate_batch(texts) == [f'[zh-cn] {t}' for t in texts]
+    assert fake_google.calls == texts
+
+def test_engine_charges_one_token_per_request(fake_google):
+    texts = [f'Paragraph number {i}.' for i in range(5)]
+    engine = translate_articles.make_engine(rate=1000, burst=10)
+    assert engine.translate_many(texts) == [f'[zh-cn] {t}' for t in texts]
+    assert sorted(fake_google.calls) == sorted(texts)
+    assert engine.requests == len(texts)
@@ -0,0 +1,41 @@
+import json
+import os
+
+import check_translation_progress
+from translation_progress import ProgressReporter, read_status
+
+def counts(pending=0, in_flight=0, done=0, failed=0):
+    return {'pending': pending, 'in_flight': in_flight, 'done': done, 'failed': failed}
+
+def test_totals_cover_the_current_run_only(tmp_path):
+    reporter = ProgressReporter(str(tmp_path / 'status.json'), str(tmp_path / 'events.jsonl'))
+    # Three failures left over from an earlier run, ten paragraphs queued for this one
+    reporter.start(5, counts(pending=10, failed=3), 2)
+    status = read_status(reporter.status_path)
+    assert (status['done'], status['paragraphs_total'], status['failed']) == (0, 10, 0)
+
+    reporter.update(counts(pending=6, done=3, failed=4), 2)
+    status = read_status(reporter.status_path)
+    assert (status['done'], status['pending'], status['failed'], status['paragraphs_total']) == (3, 6, 1, 10)
+
+    # Written rows leave the queue but stay counted as done
+    reporter.update(counts(pending=6, failed=4), 1, written=3)
+    status = read_status(reporter.status_path)
+    assert (status['done'], status['paragraphs_total'], status['written']) == (3, 10, 3)
+    reporter.finish(counts(failed=4), 1)
+
+def test_stale_status_falls_back_to_scanning(tmp_path, monkeypatch, capsys):
+    articles = tmp_path / 'articles'
+    articles.mkdir()
+    (articles / 'done.html').write_text('<p class="chinese-text">译文</p>', encoding='utf-8')
+    (articles / 'new.html').write_text('<p class="chinese-text">[翻译占位 - Translation placeholder]</p>',
+                                       encoding='utf-8')
+    monkeypatch.chdir(tmp_path)
+    # A finished run from before new.html was added claimed everything was translated
+    with open('.translation_status.json', 'w', encoding='utf-8') as f:
+        json.dump({'state': 'finished', 'pid': os.getpid(), 'articles_total': 1, 'articles_remaining': 0,
+                   'done': 10, 'paragraphs_total': 10, 'pending': 0, 'failed': 0}, f)
+
+    check_translation_progress.check_translation_progress()
+    output = capsys.readouterr().out
+    assert 'Translated articles: 1/2' in output
@@ -0,0 +1,68 @@
+import sqlite3
+import time
+
+import translate_articles
+from translation_queue import TranslationQueue
+
+class FakeManifest:
+    def set_outputs(self, *args, **outputs):
+        pass
+
+    def save(self):
+        pass
+
+def test_written_jobs_are_removed_and_can_be_queued_again(tmp_path):
+    queue = TranslationQueue(str(tmp_path / 'queue.db'))
+    queue.enqueue('a.html', [(0, 'Hello there.')])
+    [(job_id, _)] = queue.claim(10)
+    queue.finish([(job_id, '你好')])
+    assert queue.unflushed() == {'a.html': {0: (job_id, 'Hello there.', '你好')}}
+
+    queue.discard([job_id])
+    assert queue.articles_remaining() == 0
+    assert sum(queue.counts().values()) == 0
+
+    # The placeholder came back (e.g. the article was reverted): translate it again
+    queue.enqueue('a.html', [(0, 'Hello there.')])
+    assert queue.counts()['pending'] == 1
+
+def test_rows_flushed_by_older_versions_are_dropped(tmp_path):
+    path = str(tmp_path / 'queue.db')
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE jobs (
+            id INTEGER PRIMARY KEY, filename TEXT NOT NULL, paragraph INTEGER NOT NULL, source TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt REAL NOT NULL DEFAULT 0, translation TEXT, error TEXT,
+            flushed INTEGER NOT NULL DEFAULT 0, updated REAL NOT NULL, UNIQUE (filename, paragraph));
+        INSERT INTO jobs (filename, paragraph, source, state, flushed, updated) VALUES ('a.html', 0, 'Old.', 'done', 1, 0);
+        INSERT INTO jobs (filename, paragraph, source, state, flushed, updated) VALUES ('a.html', 1, 'New.', 'done', 0, 0);
+    ''')
+    conn.close()
+
+    queue = TranslationQueue(path)
+    assert queue.counts()['done'] == 1
+    assert list(queue.unflushed()['a.html']) == [1]
+
+def test_run_queue_leaves_long_backoffs_to_the_next_run(tmp_path):
+    queue = TranslationQueue(str(tmp_path / 'queue.db'), backoff_base=3600)
+    queue.enqueue('a.html', [(0, 'A paragraph that keeps failing.')])
+
+    start = time.monotonic()
+    written = translate_articles.run_queue(queue, FakeManifest(), str(tmp_path), lambda texts: [None] * len(texts))
+    assert written == 0
+    assert time.monotonic() - start < 5
+    assert queue.counts()['pending'] == 1
+
+def test_run_queue_writes_translations_and_empties_the_queue(tmp_path):
+    from process_articles_bilingual import build_bilingual_html
+    article = tmp_path / 'a.html'
+    article.write_text(build_bilingual_html(
+        '<div class="article-content"><h1>T</h1><p>The only paragraph of this article.</p></div>'), encoding='utf-8')
+    queue = TranslationQueue(str(tmp_path / 'queue.db'))
+    translate_articles.enqueue_articles(queue, FakeManifest(), str(tmp_path), ['a.html'], full=True)
+
+    written = translate_articles.run_queue(queue, FakeManifest(), str(tmp_path), lambda texts: ['译文'] * len(texts))
+    assert written == 1
+    assert '<p class="chinese-text">译文</p>' in article.read_text(encoding='utf-8')
+    assert sum(queue.counts().values()) == 0
@@ -0,0 +1,38 @@
+from update_filter_tags import FILTER_SCRIPT, add_match_mode_button
+from webnovels_index import write_shell_page
+
+TEMPLATE = '''<html><body>
+                    <div class="tags-header">
+                        <h3>筛选标签 <span class="result-count" id="resultCount"></span></h3>
+                        <button class="clear-filters-btn" onclick="clearAllFilters()">清除筛选</button>
+                    </div>
+                    <div class="tags-container" style="display: flex;">
+                        <button class="tag-btn active" data-tag="all">全部</button>
+                    </div>
+                <div class="webnovel-content" id="webnovelContent">
+                    <div class="webnovel-article" data-tags="old">old</div>
+'''
+
+ARTICLES = [
+    {'filename': 'a.html', 'title': 'A', 'tags': 'AI OpenAI'},
+    {'filename': 'b.html', 'title': 'B', 'tags': 'AI'},
+]
+
+def test_shell_page_shares_the_tag_filter(tmp_path):
+    template = tmp_path / 'webnovels.html'
+    template.write_text(TEMPLATE, encoding='utf-8')
+    output = tmp_path / 'shell.html'
+    write_shell_page(ARTICLES, str(output), template=str(template), index_path=str(tmp_path / 'index.json'))
+
+    page = output.read_text(encoding='utf-8')
+    assert FILTER_SCRIPT in page
+    assert 'function toggleMatchMode()' in page
+    assert page.count('id="matchModeBtn"') == 1
+    assert page.index('id="matchModeBtn"') < page.index('class="clear-filters-btn"')
+    assert 'data-tag="OpenAI"' in page
+    assert 'data-tags="old"' not in page
+
+def test_match_mode_button_is_added_once():
+    once = add_match_mode_button(TEMPLATE)
+    assert '                        <button class="match-mode-btn" id="matchModeBtn"' in once
+    assert add_match_mode_button(once) == once
@@ -3,9 +3,17 @@
 Translate all article placeholders using free translation service
 Uses googletrans library (free Google Translate API)
 """
+import argparse
 import os
 import re
-from bs4 import BeautifulSoup
+from soup_parser import make_soup
+from build_manifest import BuildManifest
+from translation_engine import BatchTranslator, SegmentTranslator
+from translation_memory import TranslationMemory
+from translation_queue import TranslationQueue
+from translation_progress import ProgressReporter
+from article_pipeline import atomic_write
+import threading
 import time
 
 try:
@@ -32,9 +40,15 @@ def translate_with_google(text, max_retries=3):
     if not text or len(text.strip()) < 3:
         return text
     
+    memory = get_memory()
+    cached = memory.get(text)
+    if cached is not None:
+        return cached
+    
     for attempt in range(max_retries):
         try:
             result = translator.translate(text, src='en', dest='zh-cn')
+            memory.put(text, result.text)
             return result.text
         except Exception as e:
             if attempt < max_retries - 1:
@@ -42,24 +56,72 @@ def translate_with_google(text, max_retries=3):
                 continue
             else:
                 print(f"  Translation error: {str(e)[:100]}")
-                return f"[翻译失败: {text[:30]}...]"
+                return failure_text(text)
 
-def translate_article(filepath, translate_func):
-    """Translate all placeholders in an article"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    soup = BeautifulSoup(content, 'html.parser')
-    
-    # Find all chinese-text paragraphs with placeholder
-    chinese_paragraphs = soup.find_all('p', class_='chinese-text')
-    
-    translated_count = 0
-    for p_tag in chinese_paragraphs:
+def failure_text(text):
+    """Marker written in place of a translation that could not be obtained"""
+    return f"[翻译失败: {text[:30]}...]"
+
+_memory = None
+
+def get_memory():
+    """Translation memory shared by everything in this process"""
+    global _memory
+    if _memory is None:
+        _memory = TranslationMemory()
+    return _memory
+
+def needs_translation(text):
+    """Placeholder, or a failure left by an earlier run"""
+    return '[翻译占位' in text or 'Translation placeholder' in text or text.startswith('[翻译失败')
+
+_thread_translators = threading.local()
+
+# googletrans 4.0.0rc1 translates one string per HTTP request (Translator.translate
+# takes `text: str`), so the engine sends single-item batches: one token each
+GOOGLE_BATCH_ITEMS = 1
+
+def google_translate_batch(texts):
+    """Translate a list of texts with googletrans, one request per text"""
+    # googletrans clients are not safe to share between threads
+    client = getattr(_thread_translators, 'client', None)
+    if client is None:
+        client = _thread_translators.client = Translator()
+    return [client.translate(text, src='en', dest='zh-cn').text for text in texts]
+
+def make_engine(**options):
+    """Translation engine backed by Google Translate, rate-limited per request"""
+    options.setdefault('max_items', GOOGLE_BATCH_ITEMS)
+    return BatchTranslator(google_translate_batch, **options)
+
+def make_translator(segment=True, **options):
+    """translate_many that consults the translation memory before the batch engine
+
+    With segment=True paragraphs are split into sentences first, so the memory
+    stores and reuses individual sentences rather than whole paragraphs.
+    """
+    translate_many = get_memory().cached(make_engine(**options).translate_many)
+    if segment:
+        return SegmentTranslator(translate_many).translate_many
+    return translate_many
+
+MIN_TRANSLATE_CHARS = 5   # Shorter paragraphs are copied as-is
+QUEUE_BATCH = 20          # Paragraphs claimed, translated and reported per round
+FLUSH_INTERVAL = 30       # Seconds between writes of finished translations
+MAX_RETRY_WAIT = 60       # Longest wait for backed-off paragraphs before leaving them to the next run
+
+def pending_paragraphs(soup):
+    """(index, chinese <p>, English text) for paragraphs still needing translation
+
+    index is the paragraph's position among the article's chinese-text
+    paragraphs, which identifies it across runs.
+    """
+    pending = []
+    for index, p_tag in enumerate(soup.find_all('p', class_='chinese-text')):
         text = p_tag.get_text().strip()
         
-        # Skip if already translated (not a placeholder)
-        if '[翻译占位' not in text and 'Translation placeholder' not in text:
+        # Skip if already translated (not a placeholder or earlier failure)
+        if not needs_translation(text):
             continue
         
         # Find the corresponding English text
@@ -67,61 +129,221 @@ def translate_article(filepath, translate_func):
         if parent and parent.get('class') == ['paragraph-block']:
             english_p = parent.find('p', class_='english-text')
             if english_p:
-                english_text = english_p.get_text().strip()
-                
-                # Skip very short texts
-                if len(english_text) < 5:
-                    p_tag.string = english_text
-                    continue
-                
-                # Translate
-                chinese_text = translate_func(english_text)
-                p_tag.string = chinese_text
-                translated_count += 1
-                
-                # Rate limiting - be nice to the API
-                time.sleep(0.5)
+                pending.append((index, p_tag, english_p.get_text().strip()))
+    return pending
+
+def translate_texts(texts, translate_many):
+    """Translate texts in order, copying very short ones instead of sending them"""
+    results = list(texts)
+    todo = [i for i, text in enumerate(texts) if len(text) >= MIN_TRANSLATE_CHARS]
+    if todo:
+        for i, translation in zip(todo, translate_many([texts[i] for i in todo])):
+            results[i] = translation
+    return results
+
+def translate_html(content, translate_many):
+    """Fill translation placeholders in an article's HTML, returning (html, translated_count)
+
+    translate_many takes a list of English paragraphs and returns their
+    translations in the same order (None for any it could not translate).
+    Paragraphs that could not be translated keep their placeholder.
+    """
+    soup = make_soup(content)
+    pending = pending_paragraphs(soup)
+    
+    # Translate all paragraphs together, then map results back to their blocks
+    translations = translate_texts([english_text for _, _, english_text in pending], translate_many)
+    translated = 0
+    for (_, p_tag, _), chinese_text in zip(pending, translations):
+        if chinese_text is not None:
+            p_tag.string = chinese_text
+            translated += 1
+    
+    return str(soup), translated
+
+def apply_translations(content, translations):
+    """Write queued translations {index: (source, translation)} into an article
+
+    Returns (html, applied_indices); a paragraph is only filled while it still
+    needs translation and its English text still matches the queued source.
+    """
+    soup = make_soup(content)
+    applied = []
+    for index, p_tag, english_text in pending_paragraphs(soup):
+        if index in translations and translations[index][0] == english_text:
+            p_tag.string = translations[index][1]
+            applied.append(index)
+    return str(soup), applied
+
+def count_pending(content):
+    """Number of paragraphs still waiting for (or having failed) translation"""
+    # Match paragraph text only - the tooltip script also contains '[翻译失败]'
+    return content.count('>[翻译占位') + content.count('>[翻译失败')
+
+def translate_article(filepath, translate_many):
+    """Translate all placeholders in an article"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    content, translated_count = translate_html(content, translate_many)
     
     # Write back
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(str(soup))
+    atomic_write(filepath, content)
     
     return translated_count
 
+def enqueue_articles(queue, manifest, articles_dir, article_files, full=False):
+    """Queue every paragraph that needs translation; returns (queued, skipped) article counts"""
+    queued = 0
+    skipped = 0
+    for filename in article_files:
+        filepath = os.path.join(articles_dir, filename)
+        try:
+            # Fully translated and unchanged since - skip without parsing
+            outputs = None if full else manifest.get_outputs(filename, filepath, 'translation')
+            if outputs and outputs['pending'] == 0:
+                skipped += 1
+                continue
+            
+            with open(filepath, 'r', encoding='utf-8') as f:
+                content = f.read()
+            paragraphs = [(index, english_text) for index, _, english_text in pending_paragraphs(make_soup(content))]
+            queue.enqueue(filename, paragraphs)
+            if paragraphs:
+                queued += 1
+            else:
+                manifest.set_outputs(filename, filepath, 'translation', pending=count_pending(content))
+        except Exception as e:
+            print(f"  ✗ {filename}: Error - {str(e)[:100]}")
+    return queued, skipped
+
+def flush_translations(queue, manifest, articles_dir):
+    """Write finished translations into their articles; returns paragraphs written"""
+    written = 0
+    for filename, jobs in queue.unflushed().items():
+        filepath = os.path.join(articles_dir, filename)
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                content = f.read()
+            translations = {index: (source, translation) for index, (_, source, translation) in jobs.items()}
+            content, applied = apply_translations(content, translations)
+            if applied:
+                atomic_write(filepath, content)
+                manifest.set_outputs(filename, filepath, 'translation', pending=count_pending(content))
+            # Written ones are done with; the rest were edited or translated elsewhere since they were queued
+            queue.discard([job_id for job_id, _, _ in jobs.values()])
+            written += len(applied)
+            print(f"  ✓ {filename}: {len(applied)} paragraphs written")
+        except FileNotFoundError:
+            queue.discard([job_id for job_id, _, _ in jobs.values()])
+        except Exception as e:
+            print(f"  ✗ {filename}: Error - {str(e)[:100]}")
+    manifest.save()
+    return written
+
+def run_queue(queue, manifest, articles_dir, translate_many, batch_size=QUEUE_BATCH, flush_interval=FLUSH_INTERVAL,
+              reporter=None, max_retry_wait=MAX_RETRY_WAIT):
+    """Translate queued paragraphs until none are left, flushing as it goes; returns paragraphs written"""
+    written = 0
+    last_flush = time.monotonic()
+    
+    def flush():
+        nonlocal written, last_flush
+        flushed = flush_translations(queue, manifest, articles_dir)
+        written += flushed
+        last_flush = time.monotonic()
+        if reporter:
+            reporter.update(queue.counts(), queue.articles_remaining(), written=flushed)
+    
+    try:
+        while True:
+            jobs = queue.claim(batch_size)
+            if not jobs:
+                flush()
+                wait = queue.next_retry_in()
+                if wait is None:
+                    return written
+                if wait > max_retry_wait:
+                    print(f"  {queue.counts()['pending']} paragraphs backing off after failures "
+                          f"(next retry in {wait:.0f}s) - run again later to resume")
+                    return written
+                print(f"  Waiting {wait:.0f}s for paragraphs backing off after failures...")
+                time.sleep(wait)
+                continue
+            
+            translations = translate_texts([source for _, source in jobs], translate_many)
+            queue.finish([(job_id, translation) for (job_id, _), translation in zip(jobs, translations)])
+            counts = queue.counts()
+            print(f"  {counts['done']} done, {counts['pending']} pending, {counts['failed']} failed")
+            
+            if time.monotonic() - last_flush >= flush_interval:
+                flush()
+            elif reporter:
+                reporter.update(counts, queue.articles_remaining())
+    except KeyboardInterrupt:
+        print("\n⏸  Interrupted - writing finished translations, run again to resume")
+        queue.recover()
+        flush()
+        return written
+
 def main():
+    parser = argparse.ArgumentParser(description='Translate article placeholders')
+    parser.add_argument('--full', action='store_true', help='ignore the build manifest and rescan every article')
+    parser.add_argument('--workers', type=int, default=4, help='translation requests in flight at once')
+    parser.add_argument('--rate', type=float, default=2.0, help='translation requests per second')
+    parser.add_argument('--no-segment', action='store_true', help='translate whole paragraphs instead of sentences')
+    parser.add_argument('--retry-failed', action='store_true', help='give paragraphs that failed for good another try')
+    parser.add_argument('--flush-interval', type=float, default=FLUSH_INTERVAL,
+                        help='seconds between writing finished translations to the articles')
+    args = parser.parse_args()
+    
     articles_dir = 'articles'
     article_files = [f for f in os.listdir(articles_dir) if f.endswith('.html')]
+    manifest = BuildManifest()
     
     if not HAS_TRANSLATOR:
         print("\n❌ Translation library not available!")
         print("Please install manually: pip3 install googletrans==4.0.0-rc1")
         return
     
+    translate_many = make_translator(segment=not args.no_segment, workers=args.workers, rate=args.rate)
+    queue = TranslationQueue()
+    
+    recovered = queue.recover()
+    if recovered:
+        print(f"↻ Resuming: {recovered} paragraphs were in flight when the last run stopped")
+    if args.retry_failed:
+        print(f"↻ Retrying {queue.retry_failed()} failed paragraphs")
+    
     print(f"🌐 Starting FREE translation of {len(article_files)} articles...")
     print("Using Google Translate (free service)")
     print("This will take a while. Please be patient.\n")
     
-    total_translated = 0
-    processed = 0
-    errors = 0
+    queued, skipped = enqueue_articles(queue, manifest, articles_dir, article_files, args.full)
+    manifest.prune(article_files)
+    counts = queue.counts()
+    print(f"Queued {counts['pending']} paragraphs from {queued} articles\n")
     
-    for i, filename in enumerate(article_files, 1):
-        filepath = os.path.join(articles_dir, filename)
-        try:
-            count = translate_article(filepath, translate_with_google)
-            total_translated += count
-            processed += 1
-            print(f"[{i}/{len(article_files)}] ✓ {filename}: {count} paragraphs translated")
-        except Exception as e:
-            errors += 1
-            print(f"[{i}/{len(article_files)}] ✗ {filename}: Error - {str(e)[:100]}")
+    reporter = ProgressReporter()
+    reporter.start(len(article_files), counts, queue.articles_remaining())
+    total_translated = run_queue(queue, manifest, articles_dir, translate_many,
+                                 flush_interval=args.flush_interval, reporter=reporter)
+    
+    counts = queue.counts()
+    reporter.finish(counts, queue.articles_remaining(), state='finished' if counts['pending'] == 0 else 'interrupted')
+    queue.close()
     
     print(f"\n{'='*60}")
     print(f"Translation complete!")
-    print(f"  Articles processed: {processed}")
+    print(f"  Articles with new paragraphs: {queued}")
+    print(f"  Already translated (skipped): {skipped}")
     print(f"  Total paragraphs translated: {total_translated}")
-    print(f"  Errors: {errors}")
-    print(f"\n✅ All articles now have Chinese translations! 🎉")
+    print(f"  Paragraphs failed: {counts['failed']} (see python translation_queue.py --failed)")
+    if not args.no_segment:
+        print(f"  {translate_many.__self__.summary()}")
+    print(f"  {get_memory().summary()}")
+    if counts['failed'] == 0 and counts['pending'] == 0:
+        print(f"\n✅ All articles now have Chinese translations! 🎉")
 
 if __name__ == '__main__':
     main()
@@ -1,15 +1,21 @@
 #!/usr/bin/env python3
 """Test translation on first 3 articles"""
 import os
-from bs4 import BeautifulSoup
+from soup_parser import make_soup
 from googletrans import Translator
+from translation_memory import TranslationMemory
 import time
 
 translator = Translator()
+memory = TranslationMemory()
 
 def translate_text(text):
+    cached = memory.get(text)
+    if cached is not None:
+        return cached
     try:
         result = translator.translate(text, src='en', dest='zh-cn')
+        memory.put(text, result.text)
         return result.text
     except Exception as e:
         return f"[翻译失败: {str(e)[:50]}]"
@@ -23,7 +29,7 @@ for filename in files:
     filepath = os.path.join(articles_dir, filename)
     
     with open(filepath, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f.read(), 'html.parser')
+        soup = make_soup(f.read())
     
     chinese_pars = soup.find_all('p', class_='chinese-text')
     to_translate = [p for p in chinese_pars if '[翻译占位' in p.get_text()]
@@ -45,4 +51,5 @@ for filename in files:
     
     print(f"  ✓ Translated {count} paragraphs\n")
 
+print(memory.summary())
 print("Test complete!")
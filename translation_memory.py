@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Persistent translation memory
+
+SQLite store of finished translations keyed on the normalized source text
+plus language pair, shared by every translation script. Repeat paragraphs
+(boilerplate, quotes, syndicated copy) are served from the memory instead of
+the translation API. Failed translations are never stored.
+
+Run `python translation_memory.py` to print the memory's statistics.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+import unicodedata
+
+MEMORY_FILE = 'translation_memory.db'
+
+def normalize(text):
+    """Canonical form of a source text: NFC, whitespace collapsed"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+class TranslationMemory:
+    """SQLite-backed cache of translations with hit/miss counters"""
+
+    def __init__(self, path=MEMORY_FILE, src='en', dest='zh-cn'):
+        self.path = path
+        self.src = src
+        self.dest = dest
+        self.hits = 0      # This session
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS translations (
+                key TEXT PRIMARY KEY,
+                src TEXT NOT NULL,
+                dest TEXT NOT NULL,
+                source TEXT NOT NULL,
+                translation TEXT NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+        ''')
+
+    def key(self, text):
+        return hashlib.sha1(f"{self.src}\t{self.dest}\t{normalize(text)}".encode('utf-8')).hexdigest()
+
+    def get_many(self, texts):
+        """Cached translations for texts, in order (None for misses)"""
+        keys = [self.key(text) for text in texts]
+        found = {}
+        now = time.time()
+        with self._lock:
+            unique = list(set(keys))
+            for start in range(0, len(unique), 500):  # Stay under SQLite's variable limit
+                chunk = unique[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, translation FROM translations WHERE key IN ({','.join('?' * len(chunk))})", chunk)
+                found.update(rows)
+            results = [found.get(k) for k in keys]
+
+            hits = sum(r is not None for r in results)
+            self.hits += hits
+            self.misses += len(results) - hits
+            if found:
+                self._conn.executemany(
+                    "UPDATE translations SET hits = hits + 1, last_used = ? WHERE key = ?",
+                    [(now, k) for k in keys if k in found])
+            self._bump('hits', hits)
+            self._bump('misses', len(results) - hits)
+            self._conn.commit()
+        return results
+
+    def get(self, text):
+        return self.get_many([text])[0]
+
+    def put_many(self, pairs):
+        """Store (source, translation) pairs; None translations are skipped"""
+        now = time.time()
+        rows = [(self.key(source), self.src, self.dest, normalize(source), translation, now, now)
+                for source, translation in pairs if translation is not None]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (key, src, dest, source, translation, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+
+    def put(self, source, translation):
+        self.put_many([(source, translation)])
+
+    def cached(self, translate_many):
+        """Wrap a list translator so only unseen texts reach it, each at most once"""
+        def translate_with_memory(texts):
+            results = self.get_many(texts)
+            misses = {}
+            for i, (text, result) in enumerate(zip(texts, results)):
+                if result is None:
+                    misses.setdefault(normalize(text), []).append(i)
+            if misses:
+                sources = list(misses)
+                translations = translate_many(sources)
+                self.put_many(zip(sources, translations))
+                for source, translation in zip(sources, translations):
+                    for i in misses[source]:
+                        results[i] = translation
+            return results
+        return translate_with_memory
+
+    def _bump(self, name, amount):
+        if amount:
+            self._conn.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, amount))
+
+    def stats(self):
+        """Session and lifetime counters"""
+        with self._lock:
+            counters = dict(self._conn.execute("SELECT name, value FROM counters"))
+            entries = self._conn.execute(
+                "SELECT COUNT(*) FROM translations WHERE src = ? AND dest = ?", (self.src, self.dest)).fetchone()[0]
+        return {
+            'entries': entries,
+            'session_hits': self.hits,
+            'session_misses': self.misses,
+            'total_hits': counters.get('hits', 0),
+            'total_misses': counters.get('misses', 0),
+        }
+
+    def summary(self):
+        """One-line description of this session's hit rate"""
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups * 100 if lookups else 0
+        return f"Translation memory: {self.hits}/{lookups} hits ({rate:.1f}%), {self.stats()['entries']} entries"
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def main():
+    memory = TranslationMemory()
+    stats = memory.stats()
+    lookups = stats['total_hits'] + stats['total_misses']
+    print(f"Translation memory: {memory.path}")
+    print(f"  Entries ({memory.src} → {memory.dest}): {stats['entries']}")
+    print(f"  Lifetime lookups: {lookups}")
+    print(f"  Lifetime hits: {stats['total_hits']}" + (f" ({stats['total_hits'] / lookups * 100:.1f}%)" if lookups else ""))
+    memory.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Translation progress publishing
+
+translate_articles.py reports its progress through two small files instead
+of monitors having to rescan every article:
+- STATUS_FILE: JSON snapshot of the latest counters, rewritten atomically
+- EVENTS_FILE: one JSON line per update, for monitors to tail
+
+Both are written from queue counters, so each update costs the same no
+matter how large articles/ is. Paragraph counts cover the current run only:
+what was queued when it started, plus anything that failed along the way.
+"""
+import json
+import os
+import time
+
+STATUS_FILE = '.translation_status.json'
+EVENTS_FILE = '.translation_events.jsonl'
+
+class ProgressReporter:
+    """Publish translation counters to the status file and event log"""
+
+    def __init__(self, status_path=STATUS_FILE, events_path=EVENTS_FILE):
+        self.status_path = status_path
+        self.events_path = events_path
+        self.status = {}
+        self._events = open(events_path, 'w', encoding='utf-8')  # One run's events at a time
+
+    def start(self, articles_total, counts, articles_remaining):
+        self.status = {'pid': os.getpid(), 'started': time.time(), 'articles_total': articles_total, 'written': 0}
+        self.failed_before = counts['failed']  # Left failed by earlier runs, not part of this one
+        self.update(counts, articles_remaining, state='running')
+
+    def update(self, counts, articles_remaining, written=0, state='running'):
+        """Record queue counts (by state), articles left and paragraphs newly written to HTML
+
+        Queue rows are deleted once written, so paragraphs written during
+        this run count as done alongside the translated rows not yet written.
+        """
+        self.status['written'] += written
+        done = counts['done'] + self.status['written']
+        pending = counts['pending'] + counts['in_flight']
+        failed = max(0, counts['failed'] - self.failed_before)
+        self.status.update(
+            state=state,
+            updated=time.time(),
+            pending=pending,
+            done=done,
+            failed=failed,
+            paragraphs_total=done + pending + failed,
+            articles_remaining=articles_remaining,
+        )
+
+        tmp_path = self.status_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.status, f)
+        os.replace(tmp_path, self.status_path)
+
+        self._events.write(json.dumps(self.status) + '\n')
+        self._events.flush()
+
+    def finish(self, counts, articles_remaining, state='finished'):
+        self.update(counts, articles_remaining, state=state)
+        self._events.close()
+
+def read_status(path=STATUS_FILE):
+    """Latest published status, or None if no translator has reported yet"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def is_running(status):
+    """Whether the translator that wrote status is still alive"""
+    if not status or status.get('state') != 'running':
+        return False
+    try:
+        os.kill(status['pid'], 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def follow_events(path=EVENTS_FILE, poll_interval=0.5):
+    """Yield events appended to the event log from now on, like `tail -f`"""
+    while not os.path.exists(path):
+        time.sleep(poll_interval)
+    with open(path, 'r', encoding='utf-8') as f:
+        f.seek(0, os.SEEK_END)
+        buffer = ''
+        while True:
+            line = f.readline()
+            if not line:
+                if os.path.getsize(path) < f.tell():
+                    f.seek(0)  # A new run truncated the log
+                    continue
+                yield None  # Let the caller notice a translator that died silently
+                time.sleep(poll_interval)
+                continue
+            buffer += line
+            if not buffer.endswith('\n'):
+                continue  # Partial line, the rest is still being written
+            try:
+                yield json.loads(buffer)
+            except ValueError:
+                pass
+            buffer = ''
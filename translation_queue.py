@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Durable paragraph translation queue
+
+One SQLite row per paragraph waiting for translation, identified by article
+filename and paragraph position. Jobs move pending -> in_flight -> done, or
+back to pending with an exponential backoff when a translation fails, and
+end up failed after MAX_ATTEMPTS. Finished translations are flushed into the
+article HTML in batches and their rows deleted, so a placeholder that comes
+back later is queued afresh; an interrupted run resumes from the queue, with
+in-flight jobs returned to pending.
+
+Run `python translation_queue.py` to print the queue's state.
+"""
+import argparse
+import sqlite3
+import time
+
+QUEUE_FILE = 'translation_queue.db'
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 30        # Seconds before the first retry, doubled on each further attempt
+BACKOFF_MAX = 15 * 60
+
+STATES = ['pending', 'in_flight', 'done', 'failed']
+
+class TranslationQueue:
+    """SQLite-backed queue of paragraph translation jobs"""
+
+    def __init__(self, path=QUEUE_FILE, max_attempts=MAX_ATTEMPTS, backoff_base=BACKOFF_BASE):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY,
+                filename TEXT NOT NULL,
+                paragraph INTEGER NOT NULL,
+                source TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL DEFAULT 0,
+                translation TEXT,
+                error TEXT,
+                updated REAL NOT NULL,
+                UNIQUE (filename, paragraph)
+            );
+            CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, next_attempt);
+        ''')
+        # Queues from before rows were deleted on flush kept written translations around
+        if any(column[1] == 'flushed' for column in self._conn.execute("PRAGMA table_info(jobs)")):
+            self._conn.execute("DELETE FROM jobs WHERE flushed = 1")
+            self._conn.commit()
+
+    def recover(self):
+        """Return jobs left in flight by an interrupted run to pending; returns how many"""
+        cursor = self._conn.execute(
+            "UPDATE jobs SET state = 'pending', updated = ? WHERE state = 'in_flight'", (time.time(),))
+        self._conn.commit()
+        return cursor.rowcount
+
+    def enqueue(self, filename, paragraphs):
+        """Queue (paragraph index, English source) pairs for an article
+
+        Paragraphs already queued with the same source keep their state; a
+        changed source (the article was edited) starts over as pending.
+        """
+        now = time.time()
+        self._conn.executemany('''
+            INSERT INTO jobs (filename, paragraph, source, updated) VALUES (?, ?, ?, ?)
+            ON CONFLICT (filename, paragraph) DO UPDATE SET
+                source = excluded.source, state = 'pending', attempts = 0, next_attempt = 0,
+                translation = NULL, error = NULL, updated = excluded.updated
+            WHERE source != excluded.source
+        ''', [(filename, index, source, now) for index, source in paragraphs])
+        self._conn.commit()
+
+    def claim(self, limit):
+        """Mark up to limit due pending jobs in flight; returns (id, source) pairs"""
+        now = time.time()
+        rows = self._conn.execute(
+            "SELECT id, source FROM jobs WHERE state = 'pending' AND next_attempt <= ? ORDER BY id LIMIT ?",
+            (now, limit)).fetchall()
+        self._conn.executemany(
+            "UPDATE jobs SET state = 'in_flight', updated = ? WHERE id = ?", [(now, job_id) for job_id, _ in rows])
+        self._conn.commit()
+        return rows
+
+    def finish(self, results, error='translation failed'):
+        """Record (id, translation) results; None schedules a retry or marks the job failed"""
+        now = time.time()
+        for job_id, translation in results:
+            if translation is not None:
+                self._conn.execute(
+                    "UPDATE jobs SET state = 'done', translation = ?, error = NULL, updated = ? WHERE id = ?",
+                    (translation, now, job_id))
+                continue
+            attempts = self._conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()[0] + 1
+            if attempts >= self.max_attempts:
+                self._conn.execute(
+                    "UPDATE jobs SET state = 'failed', attempts = ?, error = ?, updated = ? WHERE id = ?",
+                    (attempts, error, now, job_id))
+            else:
+                delay = min(self.backoff_base * 2 ** (attempts - 1), BACKOFF_MAX)
+                self._conn.execute(
+                    "UPDATE jobs SET state = 'pending', attempts = ?, next_attempt = ?, error = ?, updated = ? "
+                    "WHERE id = ?", (attempts, now + delay, error, now, job_id))
+        self._conn.commit()
+
+    def next_retry_in(self):
+        """Seconds until the next backed-off job is due, or None if nothing is pending"""
+        row = self._conn.execute("SELECT MIN(next_attempt) FROM jobs WHERE state = 'pending'").fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def unflushed(self):
+        """Finished translations not yet written to their articles: {filename: {paragraph: (id, source, translation)}}"""
+        pending = {}
+        rows = self._conn.execute(
+            "SELECT id, filename, paragraph, source, translation FROM jobs WHERE state = 'done'")
+        for job_id, filename, paragraph, source, translation in rows:
+            pending.setdefault(filename, {})[paragraph] = (job_id, source, translation)
+        return pending
+
+    def discard(self, job_ids):
+        """Drop jobs that are written to their article or no longer match it"""
+        self._conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in job_ids])
+        self._conn.commit()
+
+    def retry_failed(self):
+        """Give failed jobs a fresh set of attempts; returns how many"""
+        cursor = self._conn.execute(
+            "UPDATE jobs SET state = 'pending', attempts = 0, next_attempt = 0, updated = ? WHERE state = 'failed'",
+            (time.time(),))
+        self._conn.commit()
+        return cursor.rowcount
+
+    def counts(self):
+        """Number of jobs in each state"""
+        counts = dict.fromkeys(STATES, 0)
+        counts.update(self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state"))
+        return counts
+
+    def articles_remaining(self):
+        """Number of articles with paragraphs not yet translated and written"""
+        return self._conn.execute("SELECT COUNT(DISTINCT filename) FROM jobs").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Show the translation queue')
+    parser.add_argument('--failed', action='store_true', help='list failed paragraphs')
+    args = parser.parse_args()
+
+    queue = TranslationQueue()
+    counts = queue.counts()
+    print(f"Translation queue: {queue.path}")
+    for state in STATES:
+        print(f"  {state:<10} {counts[state]}")
+    if args.failed:
+        for filename, paragraph, error, source in queue._conn.execute(
+                "SELECT filename, paragraph, error, source FROM jobs WHERE state = 'failed' ORDER BY filename, paragraph"):
+            print(f"  {filename} #{paragraph}: {error} - {source[:60]}")
+    queue.close()
+
+if __name__ == '__main__':
+    main()
@@ -2,79 +2,71 @@
 """
 Update webnovels.html with multi-select tag filtering
 """
+import json
 import re
-from bs4 import BeautifulSoup
+import sys
 
-# Read current webnovels.html
-with open('webnovels.html', 'r', encoding='utf-8') as f:
-    content = f.read()
+ARTICLE_TAGS_RE = re.compile(r'<div class="webnovel-article" data-tags="([^"]*)"')
+TAG_INDEX_RE = re.compile(r'const TAG_INDEX = .*;')
+TAGS_CONTAINER_RE = re.compile(r'(<div class="tags-container"[^>]*>\n).*?(\n *</div>)', re.DOTALL)
+CLEAR_FILTERS_RE = re.compile(r'( *)(<button class="clear-filters-btn")')
 
-soup = BeautifulSoup(content, 'html.parser')
+def collect_tags(content):
+    """(sorted unique tags, article count) from the article entries of a webnovels page"""
+    all_tags = set()
+    articles = ARTICLE_TAGS_RE.findall(content)
+    for tags_attr in articles:
+        all_tags.update(tags_attr.split())
+    return sorted(all_tags), len(articles)
 
-# Extract all unique tags from all articles
-all_tags = set()
-articles = soup.find_all('div', class_='webnovel-article')
-for article in articles:
-    tags_attr = article.get('data-tags', '')
-    if tags_attr:
-        tags = tags_attr.split()
-        all_tags.update(tags)
+def build_tag_index(content):
+    """Inverted index of the page's articles: tag -> sorted article positions"""
+    index = {}
+    for position, tags_attr in enumerate(ARTICLE_TAGS_RE.findall(content)):
+        for tag in tags_attr.split():
+            index.setdefault(tag, []).append(position)
+    return dict(sorted(index.items()))
 
-# Sort tags alphabetically
-sorted_tags = sorted(all_tags)
+def tag_index_js(index):
+    """JavaScript declaration of the tag index, on one line"""
+    return 'const TAG_INDEX = ' + json.dumps(index, ensure_ascii=False, separators=(',', ':')) + ';'
 
-print(f"Found {len(sorted_tags)} unique tags across {len(articles)} articles:")
-print(', '.join(sorted_tags))
+def refresh_tag_index(content):
+    """Rebuild the TAG_INDEX declaration of a page that has one"""
+    return TAG_INDEX_RE.sub(lambda m: tag_index_js(build_tag_index(content)), content, count=1)
 
-# Create new tag filter HTML
-tag_buttons_html = '\n'.join([
-    f'                        <button class="tag-btn" data-tag="{tag}">{tag}</button>'
-    for tag in sorted_tags
-])
+def tag_buttons_html(tags):
+    """Filter buttons for tags, one per line"""
+    return '\n'.join([
+        f'                        <button class="tag-btn" data-tag="{tag}">{tag}</button>'
+        for tag in tags
+    ])
 
-# Find and replace the tag filter section
-# Look for the webnovel-tags div
-tag_section_start = content.find('<div class="webnovel-tags">')
-tag_section_end = content.find('</div>', tag_section_start) + len('</div>')
+def refresh_tag_buttons(content, tags):
+    """Replace the buttons in the page's tag filter with "All" plus tags, keeping its layout"""
+    buttons = '                        <button class="tag-btn active" data-tag="all">全部</button>\n' + tag_buttons_html(tags)
+    return TAGS_CONTAINER_RE.sub(lambda m: m.group(1) + buttons + m.group(2), content, count=1)
 
-if tag_section_start == -1:
-    print("Error: Could not find tag section")
-    exit(1)
+MATCH_MODE_BUTTON = '<button class="match-mode-btn" id="matchModeBtn" onclick="toggleMatchMode()">匹配任一标签</button>'
 
-# Build new tag section with "All" button and all extracted tags
-new_tag_section = f'''<div class="webnovel-tags">
-                    <div class="tags-header">
-                        <h3>筛选标签</h3>
-                        <button class="clear-filters-btn" onclick="clearAllFilters()">清除所有筛选</button>
-                    </div>
-                    <div class="tags-container">
-                        <button class="tag-btn active" data-tag="all">全部</button>
-{tag_buttons_html}
-                    </div>
-                </div>'''
-
-# Replace old tag section
-new_content = content[:tag_section_start] + new_tag_section + content[tag_section_end:]
-
-# Update the JavaScript for multi-select functionality
-js_start = new_content.find('const ARTICLES_PER_PAGE = 10;')
-js_end = new_content.find('</script>', js_start)
+def add_match_mode_button(content, style=''):
+    """Put the ANY/ALL toggle before the page's clear-filters button, unless it has one"""
+    if 'id="matchModeBtn"' in content:
+        return content
+    button = MATCH_MODE_BUTTON.replace('>', f' style="{style}">', 1) if style else MATCH_MODE_BUTTON
+    return CLEAR_FILTERS_RE.sub(lambda m: m.group(1) + button + '\n' + m.group(1) + m.group(2), content, count=1)
 
-if js_start == -1 or js_end == -1:
-    print("Error: Could not find JavaScript section")
-    exit(1)
-
-new_javascript = '''const ARTICLES_PER_PAGE = 10;
+# Tag filtering shared by the static webnovels pages and the shell page that
+# renders the JSON index. The page declares TAG_INDEX (tag -> sorted article
+# ids) and defines articleCount() and showPage(); it calls setupTagButtons()
+# once the DOM is loaded.
+FILTER_SCRIPT = '''
         let currentPage = 1;
         let selectedTags = new Set(['all']); // Multi-select tags
-        let allArticles = [];
-        let filteredArticles = [];
+        let matchAll = false; // false: articles with ANY selected tag, true: with ALL of them
+        let filteredIds = null; // Sorted article ids matching the filter, null for all articles
         
-        // Initialize on page load
-        document.addEventListener('DOMContentLoaded', function() {
-            allArticles = Array.from(document.querySelectorAll('.webnovel-article'));
-            filteredArticles = allArticles;
-            
+        function setupTagButtons() {
             // Tag filtering with multi-select
             const tagButtons = document.querySelectorAll('.tag-btn');
             tagButtons.forEach(button => {
@@ -112,9 +104,7 @@ new_javascript = '''const ARTICLES_PER_PAGE = 10;
                     filterArticles();
                 });
             });
-            
-            updatePagination();
-        });
+        }
         
         function clearAllFilters() {
             selectedTags.clear();
@@ -129,33 +119,66 @@ new_javascript = '''const ARTICLES_PER_PAGE = 10;
             filterArticles();
         }
         
+        function toggleMatchMode() {
+            matchAll = !matchAll;
+            const button = document.getElementById('matchModeBtn');
+            if (button) button.textContent = matchAll ? '匹配全部标签' : '匹配任一标签';
+            filterArticles();
+        }
+        
+        // Set operations on sorted id lists
+        function unionIds(a, b) {
+            const result = [];
+            let i = 0, j = 0;
+            while (i < a.length || j < b.length) {
+                if (j >= b.length || (i < a.length && a[i] < b[j])) result.push(a[i++]);
+                else if (i >= a.length || b[j] < a[i]) result.push(b[j++]);
+                else { result.push(a[i++]); j++; }
+            }
+            return result;
+        }
+        
+        function intersectIds(a, b) {
+            const result = [];
+            let i = 0, j = 0;
+            while (i < a.length && j < b.length) {
+                if (a[i] < b[j]) i++;
+                else if (b[j] < a[i]) j++;
+                else { result.push(a[i++]); j++; }
+            }
+            return result;
+        }
+        
         function filterArticles() {
             if (selectedTags.has('all')) {
                 // Show all articles
-                filteredArticles = allArticles;
+                filteredIds = null;
             } else {
-                // Show articles that match ANY of the selected tags
-                filteredArticles = allArticles.filter(article => {
-                    const articleTags = article.getAttribute('data-tags');
-                    if (!articleTags) return false;
-                    
-                    const tags = articleTags.split(' ');
-                    // Check if article has ANY of the selected tags
-                    return tags.some(tag => selectedTags.has(tag));
-                });
+                const lists = Array.from(selectedTags, tag => TAG_INDEX[tag] || []);
+                if (matchAll) {
+                    // Intersect starting from the rarest tag to keep intermediate lists small
+                    lists.sort((a, b) => a.length - b.length);
+                    filteredIds = lists.reduce(intersectIds);
+                } else {
+                    filteredIds = lists.reduce(unionIds);
+                }
             }
             
             currentPage = 1;
-            updatePagination();
+            showPage();
             
             // Update result count
             updateResultCount();
         }
         
+        function filteredCount() {
+            return filteredIds === null ? articleCount() : filteredIds.length;
+        }
+        
         function updateResultCount() {
             const resultText = selectedTags.has('all') 
-                ? `共 ${filteredArticles.length} 篇文章`
-                : `找到 ${filteredArticles.length} 篇文章`;
+                ? `共 ${filteredCount()} 篇文章`
+                : `找到 ${filteredCount()} 篇文章`;
             
             let countElement = document.getElementById('resultCount');
             if (!countElement) {
@@ -168,20 +191,86 @@ new_javascript = '''const ARTICLES_PER_PAGE = 10;
                 }
             }
             countElement.textContent = resultText;
+        }'''
+
+def main():
+    # Read current webnovels.html
+    with open('webnovels.html', 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    # Extract all unique tags from all articles, sorted alphabetically
+    sorted_tags, article_count = collect_tags(content)
+    tag_index = build_tag_index(content)
+
+    print(f"Found {len(sorted_tags)} unique tags across {article_count} articles:")
+    print(', '.join(sorted_tags))
+
+    # Create new tag filter HTML
+    tag_buttons = tag_buttons_html(sorted_tags)
+
+    # Find and replace the tag filter section
+    # Look for the webnovel-tags div
+    tag_section_start = content.find('<div class="webnovel-tags">')
+    tag_section_end = content.find('</div>', tag_section_start) + len('</div>')
+
+    if tag_section_start == -1:
+        print("Error: Could not find tag section")
+        sys.exit(1)
+
+    # Build new tag section with "All" button and all extracted tags
+    new_tag_section = f'''<div class="webnovel-tags">
+                    <div class="tags-header">
+                        <h3>筛选标签</h3>
+                        {MATCH_MODE_BUTTON}
+                        <button class="clear-filters-btn" onclick="clearAllFilters()">清除所有筛选</button>
+                    </div>
+                    <div class="tags-container">
+                        <button class="tag-btn active" data-tag="all">全部</button>
+{tag_buttons}
+                    </div>
+                </div>'''
+
+    # Replace old tag section
+    new_content = content[:tag_section_start] + new_tag_section + content[tag_section_end:]
+
+    # Update the JavaScript for multi-select functionality
+    js_start = new_content.find('const ARTICLES_PER_PAGE = 10;')
+    js_end = new_content.find('</script>', js_start)
+
+    if js_start == -1 or js_end == -1:
+        print("Error: Could not find JavaScript section")
+        sys.exit(1)
+
+    new_javascript = '''const ARTICLES_PER_PAGE = 10;
+        ''' + tag_index_js(tag_index) + FILTER_SCRIPT + '''
+        let allArticles = [];
+        let visibleArticles = [];
+        
+        // Initialize on page load
+        document.addEventListener('DOMContentLoaded', function() {
+            // Article ids in TAG_INDEX are positions in this list
+            allArticles = Array.from(document.querySelectorAll('.webnovel-article'));
+            setupTagButtons();
+            showPage();
+        });
+        
+        function articleCount() {
+            return allArticles.length;
         }
         
-        function updatePagination() {
-            const totalPages = Math.ceil(filteredArticles.length / ARTICLES_PER_PAGE);
+        function showPage() {
+            const totalPages = Math.ceil(filteredCount() / ARTICLES_PER_PAGE);
             const startIndex = (currentPage - 1) * ARTICLES_PER_PAGE;
-            const endIndex = startIndex + ARTICLES_PER_PAGE;
-            
-            // Hide all articles first
-            allArticles.forEach(article => article.style.display = 'none');
+            const endIndex = Math.min(startIndex + ARTICLES_PER_PAGE, filteredCount());
             
-            // Show only current page articles
-            filteredArticles.slice(startIndex, endIndex).forEach(article => {
-                article.style.display = 'block';
-            });
+            // Only the previous and the new page's articles are touched
+            visibleArticles.forEach(article => article.classList.remove('on-page'));
+            visibleArticles = [];
+            for (let i = startIndex; i < endIndex; i++) {
+                const article = allArticles[filteredIds === null ? i : filteredIds[i]];
+                article.classList.add('on-page');
+                visibleArticles.push(article);
+            }
             
             // Update pagination info
             document.getElementById('currentPage').textContent = currentPage;
@@ -199,23 +288,23 @@ new_javascript = '''const ARTICLES_PER_PAGE = 10;
         }
         
         function changePage(direction) {
-            const totalPages = Math.ceil(filteredArticles.length / ARTICLES_PER_PAGE);
+            const totalPages = Math.ceil(filteredCount() / ARTICLES_PER_PAGE);
             currentPage += direction;
             
-            if (currentPage < 1) currentPage = 1;
             if (currentPage > totalPages) currentPage = totalPages;
+            if (currentPage < 1) currentPage = 1;
             
-            updatePagination();
+            showPage();
         }'''
 
-new_content = new_content[:js_start] + new_javascript + '\n    ' + new_content[js_end:]
+    new_content = new_content[:js_start] + new_javascript + '\n    ' + new_content[js_end:]
 
-# Add additional CSS for the new UI
-css_insertion_point = new_content.find('/* Pagination styles */')
-if css_insertion_point == -1:
-    css_insertion_point = new_content.find('.pagination {')
+    # Add additional CSS for the new UI
+    css_insertion_point = new_content.find('/* Pagination styles */')
+    if css_insertion_point == -1:
+        css_insertion_point = new_content.find('.pagination {')
 
-new_css = '''/* Tag filter styles */
+    new_css = '''/* Tag filter styles */
         .webnovel-tags {
             margin-bottom: 30px;
             padding: 20px;
@@ -238,6 +327,25 @@ new_css = '''/* Tag filter styles */
             font-size: 1.2rem;
         }
         
+        /* Only the current page's articles are shown */
+        .webnovel-content .webnovel-article {
+            display: none;
+        }
+        
+        .webnovel-content .webnovel-article.on-page {
+            display: block;
+        }
+        
+        .match-mode-btn {
+            background-color: #fff;
+            color: #5a3e2b;
+            border: 2px solid #d4c4b0;
+            padding: 6px 14px;
+            border-radius: 5px;
+            cursor: pointer;
+            font-size: 0.9rem;
+        }
+        
         .clear-filters-btn {
             background-color: #d9534f;
             color: white;
@@ -303,14 +411,18 @@ new_css = '''/* Tag filter styles */
         
         '''
 
-new_content = new_content[:css_insertion_point] + new_css + new_content[css_insertion_point:]
+    new_content = new_content[:css_insertion_point] + new_css + new_content[css_insertion_point:]
+
+    # Write the updated file
+    with open('webnovels_multiselect.html', 'w', encoding='utf-8') as f:
+        f.write(new_content)
 
-# Write the updated file
-with open('webnovels_multiselect.html', 'w', encoding='utf-8') as f:
-    f.write(new_content)
+    print(f"\n✓ Created webnovels_multiselect.html")
+    print(f"  - {len(sorted_tags)} unique tags available for filtering")
+    print(f"  - Multi-select: click to select, click again to deselect")
+    print(f"  - Articles matching ANY (or, toggled, ALL) selected tags will be shown")
+    print(f"  - Tag index: {sum(len(ids) for ids in tag_index.values())} entries, {len(tag_index_js(tag_index)) / 1024:.1f} KB")
+    print(f"\nRun: mv webnovels.html webnovels_single_filter.html && mv webnovels_multiselect.html webnovels.html")
 
-print(f"\n✓ Created webnovels_multiselect.html")
-print(f"  - {len(sorted_tags)} unique tags available for filtering")
-print(f"  - Multi-select: click to select, click again to deselect")
-print(f"  - Articles matching ANY selected tag will be shown")
-print(f"\nRun: mv webnovels.html webnovels_single_filter.html && mv webnovels_multiselect.html webnovels.html")
+if __name__ == '__main__':
+    main()
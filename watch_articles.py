@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Watch articles/ and keep webnovels.html up to date
+
+Instead of re-running the full rebuild scripts after every change, this
+daemon re-tags only the articles that changed, patches their entries in
+webnovels.html in place and refreshes the tag filter and its index. Bursts of file events
+(an editor saving, a batch copy) are debounced into one update.
+
+A shell page generated with --json is kept current by patching
+webnovels_index.json instead.
+
+Uses inotify through the optional inotify_simple package
+(`pip install inotify_simple`) and falls back to polling modification times
+when it is not installed (or with --poll).
+"""
+import argparse
+import os
+import re
+import time
+from add_tags_and_pagination import articles_dir, collect_articles_data, render_article_entry
+from keyword_tagger import DocumentFrequencies
+from article_pipeline import atomic_write
+from build_manifest import BuildManifest
+from update_filter_tags import collect_tags, refresh_tag_buttons, refresh_tag_index
+from webnovels_index import INDEX_FILE, is_shell_page, load_index, patch_index
+
+try:
+    from inotify_simple import INotify, flags
+    HAS_INOTIFY = True
+except ImportError:
+    HAS_INOTIFY = False
+
+PAGE_FILE = 'webnovels.html'
+DEBOUNCE = 0.2          # Seconds without new events before an update runs
+MAX_DELAY = 1.0         # Update at the latest this long after the first event of a burst
+POLL_INTERVAL = 0.5
+
+ENTRY_RE = re.compile(
+    r' *<div class="webnovel-article"[^>]*>\n.*?<div class="article-tags">\n.*?\n *</div>\n *</div>\n?', re.DOTALL)
+HREF_RE = re.compile(r'href="articles/([^"]*)"')
+
+def is_article(name):
+    # Temporary files from atomic writes start with a dot
+    return name.endswith('.html') and not name.startswith('.')
+
+class InotifyWatcher:
+    """Changed article names from inotify events"""
+
+    def __init__(self, directory):
+        self.inotify = INotify()
+        self.inotify.add_watch(directory, flags.CLOSE_WRITE | flags.MOVED_TO | flags.MOVED_FROM | flags.DELETE)
+
+    def changes(self, timeout):
+        """Names changed since the last call, waiting up to timeout seconds (None: forever)"""
+        events = self.inotify.read(timeout=None if timeout is None else int(timeout * 1000))
+        return {event.name for event in events if is_article(event.name)}
+
+class PollingWatcher:
+    """Changed article names from comparing directory snapshots"""
+
+    def __init__(self, directory, interval=POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for entry in os.scandir(self.directory):
+            if is_article(entry.name):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def changes(self, timeout):
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        old, self.snapshot = self.snapshot, self._scan()
+        return {name for name in old.keys() | self.snapshot.keys() if old.get(name) != self.snapshot.get(name)}
+
+def listed_articles(content):
+    """Filenames of the articles listed on the page"""
+    return [HREF_RE.search(m.group(0)).group(1) for m in ENTRY_RE.finditer(content)]
+
+def patch_entries(content, changes):
+    """Apply {filename: entry HTML, or None to remove} to the page's article list
+
+    Existing entries are replaced in place; new ones are inserted in filename
+    order, which is how the list generators sort them.
+    """
+    matches = list(ENTRY_RE.finditer(content))
+    if not matches:
+        raise ValueError("no article entries found in the page")
+
+    listed = {HREF_RE.search(m.group(0)).group(1) for m in matches}
+    new_entries = sorted((filename, entry) for filename, entry in changes.items()
+                         if entry is not None and filename not in listed)
+
+    pieces = []
+    position = 0
+    for match in matches:
+        filename = HREF_RE.search(match.group(0)).group(1)
+        pieces.append(content[position:match.start()])
+        while new_entries and new_entries[0][0] < filename:
+            pieces.append(new_entries.pop(0)[1] + '\n')
+        if filename not in changes:
+            pieces.append(match.group(0))
+        elif changes[filename] is not None:
+            pieces.append(changes[filename] + ('\n' if match.group(0).endswith('\n') else ''))
+        position = match.end()
+
+    # Anything sorting after the last listed article goes at the end of the list
+    for _, entry in new_entries:
+        if not pieces[-1].endswith('\n'):
+            pieces.append('\n')
+        pieces.append(entry)
+    pieces.append(content[position:])
+    return ''.join(pieces)
+
+def apply_changes(filenames, manifest, page=PAGE_FILE):
+    """Re-tag the changed articles and patch them and the tag filter into the page"""
+    start = time.perf_counter()
+    present = sorted(f for f in filenames if os.path.exists(os.path.join(articles_dir, f)))
+
+    records = {filename: None for filename in filenames if filename not in present}
+    frequencies = DocumentFrequencies(manifest.index('tag_df'))
+    for filename in records:
+        frequencies.remove(filename)
+    for data in collect_articles_data(present, manifest):
+        records[data['filename']] = data
+
+    with open(page, 'r', encoding='utf-8') as f:
+        content = f.read()
+    if is_shell_page(content):
+        patch_index(records, INDEX_FILE)
+        indexed = load_index(INDEX_FILE)
+        article_count = len(indexed)
+        tags = sorted({tag for data in indexed for tag in data['tags'].split()})
+        new_content = refresh_tag_buttons(content, tags)
+    else:
+        changes = {filename: data and render_article_entry(data) for filename, data in records.items()}
+        new_content = patch_entries(content, changes)
+        tags, article_count = collect_tags(new_content)
+        new_content = refresh_tag_buttons(new_content, tags)
+        new_content = refresh_tag_index(new_content)
+    if new_content != content:
+        atomic_write(page, new_content)
+
+    if len(present) < len(filenames):
+        manifest.prune(f for f in os.listdir(articles_dir) if is_article(f))
+    manifest.save()
+
+    removed = len(filenames) - len(present)
+    print(f"↻ {page}: {len(present)} updated, {removed} removed, "
+          f"{article_count} articles / {len(tags)} tags ({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+def sync(manifest, page=PAGE_FILE):
+    """Bring the page in line with articles/ for changes made while not watching"""
+    with open(page, 'r', encoding='utf-8') as f:
+        content = f.read()
+    if is_shell_page(content):
+        listed = {data['filename'] for data in load_index(INDEX_FILE)}
+    else:
+        listed = set(listed_articles(content))
+    on_disk = {f for f in os.listdir(articles_dir) if is_article(f)}
+    # Listed articles whose content changed since they were last tagged here
+    stale = {f for f in listed & on_disk if f in manifest.articles
+             and manifest.get_outputs(f, os.path.join(articles_dir, f), 'tags') is None}
+    changed = (on_disk ^ listed) | stale
+    if changed:
+        apply_changes(changed, manifest, page)
+
+def watch(watcher, manifest, page=PAGE_FILE):
+    pending = set()
+    first_event = None
+    while True:
+        changed = watcher.changes(DEBOUNCE if pending else None)
+        if changed:
+            pending |= changed
+            first_event = first_event or time.monotonic()
+            if time.monotonic() - first_event < MAX_DELAY:
+                continue
+        if pending:
+            try:
+                apply_changes(pending, manifest, page)
+            except Exception as e:
+                print(f"✗ Error updating {page}: {e}")
+            pending = set()
+            first_event = None
+
+def main():
+    parser = argparse.ArgumentParser(description='Watch articles/ and patch webnovels.html as articles change')
+    parser.add_argument('--poll', action='store_true', help='poll modification times instead of using inotify')
+    parser.add_argument('--page', default=PAGE_FILE, help=f'page to keep up to date (default: {PAGE_FILE})')
+    args = parser.parse_args()
+
+    manifest = BuildManifest()
+    sync(manifest, args.page)
+
+    if HAS_INOTIFY and not args.poll:
+        watcher = InotifyWatcher(articles_dir)
+        mode = 'inotify'
+    else:
+        watcher = PollingWatcher(articles_dir)
+        mode = f'polling every {POLL_INTERVAL}s'
+    print(f"👀 Watching {articles_dir}/ ({mode}), Ctrl+C to stop")
+
+    try:
+        watch(watcher, manifest, args.page)
+    except KeyboardInterrupt:
+        print("\n✅ Stopped watching.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+JSON index for the webnovels page
+
+Instead of inlining every article entry as HTML, the index generators can
+write the article list to webnovels_index.json and a shell page that fetches
+it and renders only the current page of entries. The shell stays the same
+size however many articles there are.
+
+The index is compact: tag names are listed once and each article refers to
+them by position. With --compress the generators also write .gz (and .br,
+when the brotli package is installed) copies for servers that serve
+precompressed files (e.g. nginx gzip_static / brotli_static).
+
+Run `python webnovels_index.py` to print the size of the current index.
+"""
+import gzip
+import json
+import os
+from update_filter_tags import FILTER_SCRIPT, add_match_mode_button, refresh_tag_buttons
+
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+INDEX_FILE = 'webnovels_index.json'
+INDEX_VERSION = 1
+CONTENT_START = '<div class="webnovel-content" id="webnovelContent">'
+# webnovels.html styles its header buttons inline
+MATCH_MODE_STYLE = ('background-color: #fff; color: #5a3e2b; border: 2px solid #d4c4b0; padding: 6px 12px; '
+                    'border-radius: 4px; cursor: pointer; font-size: 0.85rem;')
+
+def build_index(articles_data):
+    """Compact index of [{'filename', 'title', 'tags'}] article records"""
+    tags = sorted({tag for data in articles_data for tag in data['tags'].split()})
+    positions = {tag: i for i, tag in enumerate(tags)}
+    return {
+        'version': INDEX_VERSION,
+        'tags': tags,
+        'articles': [[data['filename'], data['title'], [positions[tag] for tag in data['tags'].split()]]
+                     for data in articles_data],
+    }
+
+def load_index(path=INDEX_FILE):
+    """Article records ({'filename', 'title', 'tags'}) from an index file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    return [{'filename': filename, 'title': title, 'tags': ' '.join(index['tags'][i] for i in tag_ids)}
+            for filename, title, tag_ids in index['articles']]
+
+def _write_bytes(path, data):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def write_index(articles_data, path=INDEX_FILE, compress=False):
+    """Write the index (and precompressed copies); returns {path: size in bytes}"""
+    data = json.dumps(build_index(articles_data), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    sizes = {path: len(data)}
+    _write_bytes(path, data)
+    if compress:
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        _write_bytes(path + '.gz', compressed)
+        sizes[path + '.gz'] = len(compressed)
+        if HAS_BROTLI:
+            compressed = brotli.compress(data, quality=11)
+            _write_bytes(path + '.br', compressed)
+            sizes[path + '.br'] = len(compressed)
+    # Stale precompressed copies would be served instead of the new index
+    for ext in ('.gz', '.br'):
+        if path + ext not in sizes and os.path.exists(path + ext):
+            os.remove(path + ext)
+    return sizes
+
+def patch_index(changes, path=INDEX_FILE):
+    """Apply {filename: article record, or None to remove} to an index file, keeping filename order"""
+    articles = {data['filename']: data for data in load_index(path)}
+    for filename, data in changes.items():
+        if data is None:
+            articles.pop(filename, None)
+        else:
+            articles[filename] = data
+    compress = os.path.exists(path + '.gz')
+    return write_index([articles[filename] for filename in sorted(articles)], path, compress)
+
+def is_shell_page(content):
+    """Whether a page renders its article list from the JSON index"""
+    return 'const INDEX_URL = ' in content
+
+SHELL_SCRIPT = '''
+                </div>
+
+                <!-- Pagination Controls -->
+                <div class="pagination" id="pagination">
+                    <button class="page-btn" id="prevBtn" onclick="changePage(-1)">← 上一页</button>
+                    <span class="page-info">
+                        第 <span id="currentPage">1</span> 页 / 共 <span id="totalPages">1</span> 页
+                    </span>
+                    <button class="page-btn" id="nextBtn" onclick="changePage(1)">下一页 →</button>
+                </div>
+            </main>
+        </div>
+    </div>
+
+    <script>
+        const INDEX_URL = '__INDEX_URL__';
+        const ARTICLES_PER_PAGE = 10;
+        let TAG_INDEX = {};      // Tag name -> sorted article positions, built from the index
+        let tagNames = [];
+        let articles = [];       // [filename, title, tag positions]
+''' + FILTER_SCRIPT + '''
+
+        function escapeHtml(text) {
+            return text.replace(/[&<>"']/g, c => ({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'})[c]);
+        }
+
+        document.addEventListener('DOMContentLoaded', function() {
+            setupTagButtons();
+            fetch(INDEX_URL)
+                .then(response => response.json())
+                .then(index => {
+                    tagNames = index.tags;
+                    articles = index.articles;
+                    articles.forEach((article, id) => {
+                        article[2].forEach(t => (TAG_INDEX[tagNames[t]] = TAG_INDEX[tagNames[t]] || []).push(id));
+                    });
+                    filterArticles();
+                })
+                .catch(error => {
+                    document.getElementById('webnovelContent').textContent = '文章列表加载失败: ' + error;
+                });
+        });
+
+        function articleCount() {
+            return articles.length;
+        }
+
+        function showPage() {
+            const totalPages = Math.ceil(filteredCount() / ARTICLES_PER_PAGE);
+            const start = (currentPage - 1) * ARTICLES_PER_PAGE;
+            const end = Math.min(start + ARTICLES_PER_PAGE, filteredCount());
+            const html = [];
+            for (let i = start; i < end; i++) {
+                const [filename, title, tagIds] = articles[filteredIds === null ? i : filteredIds[i]];
+                const tags = tagIds.map(t => tagNames[t]);
+                html.push(`<div class="webnovel-article on-page" data-tags="${escapeHtml(tags.join(' '))}">
+                        <h2 class="webnovel-title">
+                            <a href="articles/${encodeURIComponent(filename)}" class="webnovel-title-link">${escapeHtml(title)}</a>
+                        </h2>
+                        <div class="article-tags">
+                            ${tags.map(tag => `<span class="article-tag">${escapeHtml(tag)}</span>`).join(' ')}
+                        </div>
+                    </div>`);
+            }
+            const content = document.getElementById('webnovelContent');
+            content.innerHTML = html.join('');
+
+            document.getElementById('currentPage').textContent = currentPage;
+            document.getElementById('totalPages').textContent = totalPages || 1;
+            document.getElementById('prevBtn').disabled = currentPage === 1;
+            document.getElementById('nextBtn').disabled = currentPage === totalPages || totalPages === 0;
+        }
+
+        function changePage(direction) {
+            const totalPages = Math.ceil(filteredCount() / ARTICLES_PER_PAGE);
+            currentPage = Math.max(1, Math.min(currentPage + direction, totalPages));
+            showPage();
+            document.getElementById('webnovelContent').scrollIntoView({ behavior: 'smooth', block: 'start' });
+        }
+    </script>
+</body>
+</html>'''
+
+def write_shell_page(articles_data, output_path, template='webnovels.html', index_path=INDEX_FILE):
+    """Write a page with template's header and tag buttons that renders articles from the index"""
+    with open(template, 'r', encoding='utf-8') as f:
+        content = f.read()
+    header_end = content.find(CONTENT_START)
+    if header_end == -1:
+        raise ValueError(f"could not find the article content section in {template}")
+    header = content[:header_end + len(CONTENT_START)]
+
+    tags = sorted({tag for data in articles_data for tag in data['tags'].split()})
+    header = refresh_tag_buttons(header, tags)
+    header = add_match_mode_button(header, MATCH_MODE_STYLE)
+    index_url = os.path.relpath(index_path, os.path.dirname(os.path.abspath(output_path)) or '.')
+    page = header + SHELL_SCRIPT.replace('__INDEX_URL__', index_url.replace(os.sep, '/'))
+
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(page)
+    os.replace(tmp_path, output_path)
+    return len(page.encode('utf-8'))
+
+def write_index_and_shell(articles_data, output_path, compress=False, index_path=INDEX_FILE):
+    """The generators' --json output: index, precompressed copies and shell page"""
+    sizes = write_index(articles_data, index_path, compress)
+    shell_size = write_shell_page(articles_data, output_path, index_path=index_path)
+    print(f"\n✓ Generated {output_path} ({shell_size / 1024:.1f} KB shell) with {len(articles_data)} articles in:")
+    for path, size in sizes.items():
+        print(f"    {path}: {size / 1024:.1f} KB")
+
+def main():
+    if not os.path.exists(INDEX_FILE):
+        print(f"No {INDEX_FILE} yet - run a generator with --json")
+        return
+    articles_data = load_index()
+    print(f"{INDEX_FILE}: {len(articles_data)} articles")
+    for path in (INDEX_FILE, INDEX_FILE + '.gz', INDEX_FILE + '.br'):
+        if os.path.exists(path):
+            print(f"  {path}: {os.path.getsize(path) / 1024:.1f} KB")
+
+if __name__ == '__main__':
+    main()